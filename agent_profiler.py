@@ -0,0 +1,166 @@
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Optional, Tuple
+
+from simpleagent import ReflexAgent
+
+# Step phases timed by run_simulation, in loop order. "render" also
+# covers trace recording and the verbose print/sleep path.
+PHASES = ('perceive', 'decide', 'execute', 'render', 'goal_check')
+
+@dataclass
+class ProfileSummary:
+    """Where a simulation spent its time, plus behavior counters
+
+    Phase times are measured on sampled steps only; phase_seconds scales
+    them up to an estimate for the whole run.
+    """
+    grid_size: Tuple[int, int]
+    steps: int
+    sampled_steps: int
+    wall_time: float
+    steps_per_sec: float
+    phase_mean_us: Dict[str, float] = field(default_factory=dict)
+    phase_seconds: Dict[str, float] = field(default_factory=dict)
+    phase_share: Dict[str, float] = field(default_factory=dict)
+    goals_collected: int = 0
+    goals_per_1k_steps: float = 0.0
+    invalid_moves: int = 0
+    stays: int = 0
+    revisits: int = 0
+    cells_visited: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+class SimulationProfiler:
+    """Low-overhead profiler for ReflexAgent.run_simulation
+
+    Only one step in sample_every is timed (a handful of perf_counter calls);
+    the counters are updated on every step. With report_every set, a JSON
+    line with the summary so far is written to stream every report_every
+    steps, and one more with the final summary when the run ends.
+    """
+
+    def __init__(self, sample_every: int = 64, report_every: Optional[int] = None, stream=None):
+        self.sample_every = max(1, sample_every)
+        self.report_every = report_every
+        self.stream = stream if stream is not None else sys.stderr
+
+        self.phase_totals = {phase: 0.0 for phase in PHASES}
+        self.sampled_steps = 0
+        self.invalid_moves = 0
+        self.stays = 0
+        self.revisits = 0
+        self.visited = set()
+        self.grid_size = (0, 0)
+        self.start_steps = 0
+        self.start_goals = 0
+        self.start_time = 0.0
+        self.end_time = None
+        self.next_report = None
+        self.final: Optional[ProfileSummary] = None
+
+        self._countdown = 0
+        self._last_mark = 0.0
+
+    def begin(self, agent: ReflexAgent):
+        self.grid_size = (agent.rows, agent.cols)
+        self.start_steps = agent.steps_taken
+        self.start_goals = agent.goals_collected
+        self.visited.add(agent.position)
+        self.start_time = time.perf_counter()
+        self.end_time = None
+        if self.report_every:
+            self.next_report = agent.steps_taken + self.report_every
+
+    def start_step(self) -> bool:
+        """True if this step should be timed"""
+        if self._countdown:
+            self._countdown -= 1
+            return False
+        self._countdown = self.sample_every - 1
+        self._last_mark = time.perf_counter()
+        return True
+
+    def lap(self, phase: str):
+        """Charge the time since the previous mark to phase"""
+        now = time.perf_counter()
+        self.phase_totals[phase] += now - self._last_mark
+        self._last_mark = now
+
+    def end_step(self, agent: ReflexAgent):
+        self.sampled_steps += 1
+
+    def count_step(self, agent: ReflexAgent, old_position: Tuple[int, int],
+                   action: Tuple[int, int], success: bool):
+        if not success:
+            self.invalid_moves += 1
+        elif action == old_position:
+            self.stays += 1
+        elif agent.position in self.visited:
+            self.revisits += 1
+        else:
+            self.visited.add(agent.position)
+        if self.next_report is not None and agent.steps_taken >= self.next_report:
+            self._report(self.summary(agent))
+            self.next_report = agent.steps_taken + self.report_every
+
+    def end(self, agent: ReflexAgent):
+        self.end_time = time.perf_counter()
+        self.final = self.summary(agent)
+        if self.report_every:
+            self._report(self.final)
+
+    def _report(self, summary: ProfileSummary):
+        self.stream.write(summary.to_json() + "\n")
+        self.stream.flush()
+
+    def summary(self, agent: ReflexAgent) -> ProfileSummary:
+        """Summary of the run so far"""
+        end_time = self.end_time if self.end_time is not None else time.perf_counter()
+        wall_time = end_time - self.start_time
+        steps = agent.steps_taken - self.start_steps
+        goals = agent.goals_collected - self.start_goals
+
+        sampled = max(1, self.sampled_steps)
+        measured = sum(self.phase_totals.values()) or 1.0
+        return ProfileSummary(
+            grid_size=self.grid_size,
+            steps=steps,
+            sampled_steps=self.sampled_steps,
+            wall_time=wall_time,
+            steps_per_sec=steps / wall_time if wall_time > 0 else 0.0,
+            phase_mean_us={phase: total / sampled * 1e6 for phase, total in self.phase_totals.items()},
+            phase_seconds={phase: total / sampled * steps for phase, total in self.phase_totals.items()},
+            phase_share={phase: total / measured for phase, total in self.phase_totals.items()},
+            goals_collected=goals,
+            goals_per_1k_steps=goals * 1000 / steps if steps else 0.0,
+            invalid_moves=self.invalid_moves,
+            stays=self.stays,
+            revisits=self.revisits,
+            cells_visited=len(self.visited),
+        )
+
+# Example usage and demonstration
+if __name__ == "__main__":
+    print("=== Profiling the Agent Loop ===")
+
+    for size in (20, 100, 500):
+        agent = ReflexAgent(grid_size=(size, size), obstacle_density=0.2, storage="bytearray",
+                            seed=1, quiet=True, connected=True)
+        profiler = SimulationProfiler(sample_every=32)
+        agent.run_simulation(max_steps=100000, verbose=False, profiler=profiler)
+        summary = profiler.final
+
+        print(f"\n{size}x{size}: {summary.steps} steps at {summary.steps_per_sec:,.0f} steps/sec")
+        for phase in PHASES:
+            print(f"  {phase:<10} {summary.phase_mean_us[phase]:7.2f} us/step "
+                  f"({summary.phase_share[phase]:.0%})")
+        print(f"  goals/1k steps: {summary.goals_per_1k_steps:.2f}, stays: {summary.stays}, "
+              f"revisits: {summary.revisits}, invalid moves: {summary.invalid_moves}")
@@ -0,0 +1,179 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from simpleagent import ReflexAgent
+
+# One point of the parameter grid: (rows, cols, obstacle_density, max_steps)
+SweepConfig = Tuple[int, int, float, int]
+
+RESULT_FIELDS = [
+    'rows', 'cols', 'obstacle_density', 'max_steps', 'episodes', 'completion_rate',
+    'goal_collection_rate', 'mean_steps', 'p50_steps', 'p90_steps', 'p99_steps', 'elapsed',
+]
+
+def episode_seed(base_seed: int, config: SweepConfig, episode: int) -> int:
+    """Derive a deterministic RNG seed for one episode of one configuration"""
+    key = f"{base_seed}:{config}:{episode}".encode()
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "big")
+
+def run_episodes(config: SweepConfig, episodes: Sequence[int], base_seed: int) -> List[dict]:
+    """Run a chunk of episodes for one configuration (executed in a worker)"""
+    rows, cols, obstacle_density, max_steps = config
+    results = []
+    for episode in episodes:
+        agent = ReflexAgent(grid_size=(rows, cols), obstacle_density=obstacle_density,
+                            seed=episode_seed(base_seed, config, episode), quiet=True)
+        total_goals = agent.remaining_goals
+        agent.run_simulation(max_steps=max_steps, verbose=False)
+        results.append({
+            'steps': agent.steps_taken,
+            'goals_collected': agent.goals_collected,
+            'total_goals': total_goals,
+            'completed': agent.remaining_goals == 0,
+        })
+    return results
+
+def _percentile(sorted_values: List[int], q: float) -> Optional[int]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * q // 100))  # ceil(n * q / 100)
+    return sorted_values[int(rank) - 1]
+
+def aggregate(config: SweepConfig, results: List[dict], elapsed: float) -> dict:
+    """Summarize the episodes of one configuration"""
+    rows, cols, obstacle_density, max_steps = config
+    # Steps-to-completion only counts episodes that collected every goal
+    completion_steps = sorted(r['steps'] for r in results if r['completed'])
+    total_goals = sum(r['total_goals'] for r in results)
+    return {
+        'rows': rows,
+        'cols': cols,
+        'obstacle_density': obstacle_density,
+        'max_steps': max_steps,
+        'episodes': len(results),
+        'completion_rate': len(completion_steps) / len(results),
+        'goal_collection_rate': sum(r['goals_collected'] for r in results) / total_goals,
+        'mean_steps': sum(completion_steps) / len(completion_steps) if completion_steps else None,
+        'p50_steps': _percentile(completion_steps, 50),
+        'p90_steps': _percentile(completion_steps, 90),
+        'p99_steps': _percentile(completion_steps, 99),
+        'elapsed': round(elapsed, 4),
+    }
+
+def sweep_configs(grid_sizes: Sequence[Tuple[int, int]], densities: Sequence[float],
+                  max_steps_values: Sequence[int]) -> List[SweepConfig]:
+    """Cartesian product of the swept parameters"""
+    return [(rows, cols, density, max_steps)
+            for rows, cols in grid_sizes
+            for density in densities
+            for max_steps in max_steps_values]
+
+def run_sweep(configs: Sequence[SweepConfig], episodes: int, base_seed: int = 0,
+              workers: Optional[int] = None, chunk_size: int = 20) -> Iterator[dict]:
+    """Fan episodes out over a process pool, yielding each configuration's
+    aggregate as soon as all of its episodes have finished"""
+    configs = list(dict.fromkeys(configs))  # a repeated config is run once
+    pending: Dict[SweepConfig, List[dict]] = {config: [] for config in configs}
+    started = {config: time.perf_counter() for config in configs}
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        futures = {}
+        for config in configs:
+            for start in range(0, episodes, chunk_size):
+                chunk = range(start, min(start + chunk_size, episodes))
+                futures[executor.submit(run_episodes, config, chunk, base_seed)] = config
+
+        for future in as_completed(futures):
+            config = futures[future]
+            pending[config].extend(future.result())
+            if len(pending[config]) == episodes:
+                elapsed = time.perf_counter() - started[config]
+                yield aggregate(config, pending.pop(config), elapsed)
+
+class ResultWriter:
+    """Stream aggregated rows to a CSV or JSONL file, flushing every row"""
+
+    def __init__(self, stream, fmt: str):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == "csv":
+            self.csv_writer = csv.DictWriter(stream, fieldnames=RESULT_FIELDS)
+            self.csv_writer.writeheader()
+        elif fmt != "jsonl":
+            raise ValueError(f"Unknown output format: {fmt!r}")
+
+    def write(self, row: dict):
+        if self.fmt == "csv":
+            self.csv_writer.writerow(row)
+        else:
+            self.stream.write(json.dumps(row) + "\n")
+        self.stream.flush()
+
+def _parse_values(text: str, cast) -> list:
+    """Parse "a,b,c" or an inclusive "start:stop:step" range"""
+    if ":" in text:
+        start, stop, step = (cast(part) for part in text.split(":"))
+        if step <= 0:
+            raise ValueError(f"range step must be positive in {text!r}")
+        values = []
+        value = start
+        while value <= stop + step / 1e9:
+            values.append(round(value, 10) if cast is float else value)
+            value += step
+        return values
+    return [cast(part) for part in text.split(",") if part.strip()]
+
+def _parse_grid_sizes(text: str) -> List[Tuple[int, int]]:
+    """Parse "8x8,16x16" (a bare "8" means 8x8)"""
+    sizes = []
+    for part in text.split(","):
+        rows, _, cols = part.strip().partition("x")
+        sizes.append((int(rows), int(cols or rows)))
+    return sizes
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Parallel seeded parameter sweep for ReflexAgent")
+    parser.add_argument("--grid-sizes", default="8x8,16x16", help="e.g. 8x8,16x16")
+    parser.add_argument("--densities", default="0.1,0.2", help="e.g. 0.1,0.2 or 0.0:0.3:0.05")
+    parser.add_argument("--max-steps", default="1000", help="e.g. 500,1000 or 500:2000:500")
+    parser.add_argument("--episodes", type=int, default=100, help="episodes per configuration")
+    parser.add_argument("--seed", type=int, default=0, help="base seed for all episodes")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=20, help="episodes per worker task")
+    parser.add_argument("--output", default="-", help="output file, '-' for stdout")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None,
+                        help="output format (default: from the output extension, else jsonl)")
+    args = parser.parse_args(argv)
+    if args.episodes < 1:
+        parser.error("--episodes must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    try:
+        configs = sweep_configs(_parse_grid_sizes(args.grid_sizes),
+                                _parse_values(args.densities, float),
+                                _parse_values(args.max_steps, int))
+    except ValueError as e:
+        parser.error(str(e))
+    fmt = args.format or ("csv" if args.output.endswith(".csv") else "jsonl")
+
+    stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        writer = ResultWriter(stream, fmt)
+        for row in run_sweep(configs, args.episodes, base_seed=args.seed,
+                             workers=args.workers, chunk_size=args.chunk_size):
+            writer.write(row)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from simpleagent import CellType, Direction, ReflexAgent
+
+# Neighbor offsets in the same order ReflexAgent._get_neighbors visits them
+DIRECTION_OFFSETS = np.array([direction.value for direction in Direction], dtype=np.int64)
+
+@dataclass
+class BatchResult:
+    """Per-episode outcome of a batch run"""
+    steps: np.ndarray
+    goals_collected: np.ndarray
+    total_goals: np.ndarray
+    completed: np.ndarray
+    elapsed: float
+
+    @property
+    def num_episodes(self) -> int:
+        return len(self.steps)
+
+    def summary(self) -> dict:
+        return {
+            'episodes': self.num_episodes,
+            'mean_steps': float(self.steps.mean()),
+            'mean_goals_collected': float(self.goals_collected.mean()),
+            'completion_rate': float(self.completed.mean()),
+            'steps_per_sec': float(self.steps.sum() / self.elapsed) if self.elapsed > 0 else 0.0,
+        }
+
+class BatchReflexSimulation:
+    """Run many ReflexAgent episodes in lockstep on stacked NumPy grids
+
+    Every environment follows the same rules as ReflexAgent: move to the
+    first adjacent goal, otherwise make a random move to a safe neighbor,
+    otherwise stay in place. The agent is tracked by position only, so the
+    grids hold just EMPTY, OBSTACLE and GOAL cells.
+    """
+
+    def __init__(self, num_envs: int, grid_size: Tuple[int, int], obstacle_density: float = 0.2,
+                 max_steps: int = 1000, seed: Optional[int] = None):
+        self.num_envs = num_envs
+        self.rows, self.cols = grid_size
+        self.max_steps = max_steps
+        self.rng = np.random.default_rng(seed)
+
+        self.grids = self._generate_environments(obstacle_density)
+        self.positions = np.zeros(num_envs, dtype=np.int64)  # flat index, start at (0, 0)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.goals_collected = np.zeros(num_envs, dtype=np.int64)
+        self.total_goals = np.count_nonzero(self.grids == CellType.GOAL.value, axis=1)
+        self.remaining_goals = self.total_goals.copy()
+
+    def _generate_environments(self, obstacle_density: float) -> np.ndarray:
+        """Place obstacles and goals in every environment at once"""
+        total_cells = self.rows * self.cols
+        num_obstacles = int(total_cells * obstacle_density)
+        num_goals = max(3, int(total_cells * 0.05))  # 5% goals, minimum 3
+        if num_obstacles + num_goals > total_cells - 1:
+            raise ValueError("Grid is too small for the requested obstacles and goals")
+
+        # A random permutation of the non-start cells per environment: the
+        # first cells become obstacles, the next ones goals
+        order = np.argsort(self.rng.random((self.num_envs, total_cells - 1)), axis=1) + 1
+        grids = np.zeros((self.num_envs, total_cells), dtype=np.uint8)
+        env_index = np.arange(self.num_envs)[:, None]
+        grids[env_index, order[:, :num_obstacles]] = CellType.OBSTACLE.value
+        grids[env_index, order[:, num_obstacles:num_obstacles + num_goals]] = CellType.GOAL.value
+        return grids
+
+    def _step(self, active: np.ndarray):
+        """Advance the given environments by one step"""
+        pos = self.positions[active]
+        row, col = np.divmod(pos, self.cols)
+
+        # Neighbor coordinates and cell contents, shape (len(active), 4)
+        n_row = row[:, None] + DIRECTION_OFFSETS[:, 0]
+        n_col = col[:, None] + DIRECTION_OFFSETS[:, 1]
+        in_bounds = (n_row >= 0) & (n_row < self.rows) & (n_col >= 0) & (n_col < self.cols)
+        n_flat = np.where(in_bounds, n_row * self.cols + n_col, 0)
+        cells = self.grids[active[:, None], n_flat]
+
+        is_goal = in_bounds & (cells == CellType.GOAL.value)
+        is_safe = in_bounds & (cells != CellType.OBSTACLE.value)
+
+        # Rule 3: pick uniformly among safe neighbors
+        num_safe = is_safe.sum(axis=1)
+        pick = (self.rng.random(len(active)) * num_safe).astype(np.int64)
+        choice = np.argmax(np.cumsum(is_safe, axis=1) > pick[:, None], axis=1)
+
+        # Rule 1: the first adjacent goal overrides the random move
+        has_goal = is_goal.any(axis=1)
+        choice = np.where(has_goal, np.argmax(is_goal, axis=1), choice)
+
+        # Rule 4: stay in place when boxed in
+        lanes = np.arange(len(active))
+        new_pos = np.where(num_safe > 0, n_flat[lanes, choice], pos)
+
+        collected = self.grids[active, new_pos] == CellType.GOAL.value
+        self.grids[active[collected], new_pos[collected]] = CellType.EMPTY.value
+        self.goals_collected[active] += collected
+        self.remaining_goals[active] -= collected
+        self.positions[active] = new_pos
+        self.steps[active] += 1
+
+    def run(self) -> BatchResult:
+        """Step all environments until each one finishes or hits max_steps"""
+        start = time.perf_counter()
+        active = np.flatnonzero((self.remaining_goals > 0) & (self.steps < self.max_steps))
+        while len(active):
+            self._step(active)
+            active = active[(self.remaining_goals[active] > 0) & (self.steps[active] < self.max_steps)]
+        elapsed = time.perf_counter() - start
+
+        return BatchResult(
+            steps=self.steps.copy(),
+            goals_collected=self.goals_collected.copy(),
+            total_goals=self.total_goals.copy(),
+            completed=self.remaining_goals == 0,
+            elapsed=elapsed,
+        )
+
+def run_scalar_reference(num_envs: int, grid_size: Tuple[int, int], obstacle_density: float = 0.2,
+                         max_steps: int = 1000) -> BatchResult:
+    """Run the same workload one ReflexAgent at a time, for comparison"""
+    steps, goals, total, completed = [], [], [], []
+    start = time.perf_counter()
+    for _ in range(num_envs):
+        agent = ReflexAgent(grid_size=grid_size, obstacle_density=obstacle_density, quiet=True)
+        total.append(agent.remaining_goals)
+        agent.run_simulation(max_steps=max_steps, verbose=False)
+        steps.append(agent.steps_taken)
+        goals.append(agent.goals_collected)
+        completed.append(agent.remaining_goals == 0)
+    elapsed = time.perf_counter() - start
+
+    return BatchResult(
+        steps=np.array(steps),
+        goals_collected=np.array(goals),
+        total_goals=np.array(total),
+        completed=np.array(completed),
+        elapsed=elapsed,
+    )
+
+# Example usage and demonstration
+if __name__ == "__main__":
+    print("=== Batch Reflex Agent Simulation ===")
+
+    grid_size = (10, 10)
+    batch = BatchReflexSimulation(num_envs=5000, grid_size=grid_size, obstacle_density=0.15,
+                                  max_steps=500, seed=0)
+    batch_result = batch.run()
+    scalar_result = run_scalar_reference(200, grid_size, obstacle_density=0.15, max_steps=500)
+
+    for name, result in (("batch", batch_result), ("scalar", scalar_result)):
+        print(f"\n{name}:")
+        for key, value in result.summary().items():
+            print(f"  {key}: {value:.3f}" if isinstance(value, float) else f"  {key}: {value}")
@@ -0,0 +1,13 @@
+"""Reproducible benchmarks for the project's hot paths
+
+Run ``python -m benchmarks --save base.json`` once, then after a change
+``python -m benchmarks --compare base.json`` to see regressions.
+"""
+
+from .runner import BenchmarkResult, compare, load_baseline, measure, save_baseline
+from .workloads import WORKLOADS, Workload, workload
+
+__all__ = [
+    "BenchmarkResult", "WORKLOADS", "Workload", "compare", "load_baseline",
+    "measure", "save_baseline", "workload",
+]
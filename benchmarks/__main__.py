@@ -0,0 +1,70 @@
+"""Command line: python -m benchmarks [--save FILE] [--compare FILE]"""
+
+import argparse
+import sys
+
+from .runner import (compare, format_comparison, format_results, incompatible_baseline, load_baseline,
+                     measure, measure_isolated, run_meta, save_baseline)
+from .workloads import WORKLOADS
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the benchmark suite")
+    parser.add_argument("--only", default="", help="comma-separated name prefixes, e.g. agent,grid.scan")
+    parser.add_argument("--scale", type=int, default=1, help="workload size multiplier")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed runs before timing")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--in-process", action="store_true",
+                        help="run every workload in this process (faster, but caches carry over)")
+    parser.add_argument("--save", default=None, help="write results to this JSON baseline")
+    parser.add_argument("--compare", default=None, help="compare with this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown before a regression is reported (0.10 = 10%%)")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, workload in WORKLOADS.items():
+            print(f"{name} ({workload.unit})")
+        return 0
+
+    prefixes = [prefix.strip() for prefix in args.only.split(",") if prefix.strip()]
+    selected = [workload for name, workload in WORKLOADS.items()
+                if not prefixes or any(name.startswith(prefix) for prefix in prefixes)]
+    if not selected:
+        parser.error(f"no benchmark matches {args.only!r}")
+
+    meta = run_meta([workload.name for workload in selected], args.scale, args.seed, args.repeat, args.warmup)
+    if args.in_process:
+        meta["isolation"] = "none"
+    # Load the baseline before anything is saved, in case both name the same file
+    baseline = None
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        problems = incompatible_baseline(meta, baseline)
+        if problems:
+            print(f"error: {args.compare} was measured with different settings:", file=sys.stderr)
+            for problem in problems:
+                print(f"  {problem}", file=sys.stderr)
+            return 2
+
+    run = measure if args.in_process else measure_isolated
+    results = []
+    for workload in selected:
+        print(f"running {workload.name}...", file=sys.stderr)
+        results.append(run(workload, scale=args.scale, seed=args.seed, repeat=args.repeat, warmup=args.warmup))
+    print(format_results(results))
+
+    status = 0
+    if baseline is not None:
+        rows = compare(results, baseline, args.threshold)
+        print(format_comparison(rows, args.threshold))
+        if any(row["status"] == "regression" for row in rows):
+            status = 1
+    if args.save:
+        save_baseline(args.save, results, meta)
+        print(f"Saved baseline to {args.save}")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
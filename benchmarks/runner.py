@@ -0,0 +1,159 @@
+"""Timing, peak memory, JSON baselines and regression comparison"""
+
+import gc
+import json
+import multiprocessing
+import platform
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence
+
+from .workloads import WORKLOADS, Workload
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    unit: str
+    units: float           # work done per run
+    median: float          # seconds per run
+    p10: float
+    p90: float
+    throughput: float      # units per second at the median
+    peak_kib: float        # peak traced allocation of one run
+    repeat: int
+
+def _timed(run) -> tuple:
+    """One run with a clean heap and the cyclic GC paused"""
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        units = run()
+        return units, time.perf_counter() - start
+    finally:
+        gc.enable()
+
+def measure(workload: Workload, scale: int = 1, seed: int = 0, repeat: int = 5, warmup: int = 3) -> BenchmarkResult:
+    """Time repeat runs of a workload (after warmup runs), then trace one for memory
+
+    Runs in the calling process, so module-level caches left by earlier
+    workloads affect the result; measure_isolated avoids that.
+    """
+    with workload.setup(scale, seed) as run:
+        for _ in range(warmup):
+            run()
+        times = []
+        units = 0.0
+        for _ in range(repeat):
+            units, elapsed = _timed(run)
+            times.append(elapsed)
+
+        # Tracing slows the run down, so memory gets its own untimed run
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    median = statistics.median(times)
+    if len(times) >= 2:
+        deciles = statistics.quantiles(times, n=10, method="inclusive")
+        p10, p90 = deciles[0], deciles[-1]
+    else:
+        p10 = p90 = median
+    return BenchmarkResult(workload.name, workload.unit, units, median, p10, p90,
+                           units / median if median else 0.0, peak / 1024, repeat)
+
+def _measure_by_name(name: str, scale: int, seed: int, repeat: int, warmup: int) -> BenchmarkResult:
+    return measure(WORKLOADS[name], scale, seed, repeat, warmup)
+
+def measure_isolated(workload: Workload, scale: int = 1, seed: int = 0, repeat: int = 5,
+                     warmup: int = 3) -> BenchmarkResult:
+    """measure() in a freshly spawned process, so no caches or heap state
+    carry over from other workloads"""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_measure_by_name, workload.name, scale, seed, repeat, warmup).result()
+
+def run_meta(names: Sequence[str], scale: int, seed: int, repeat: int, warmup: int) -> dict:
+    """What a set of results was measured with; baselines only compare if the
+    scale, seed and isolation match"""
+    return {"selection": sorted(names), "scale": scale, "seed": seed,
+            "repeat": repeat, "warmup": warmup, "isolation": "subprocess"}
+
+def incompatible_baseline(meta: dict, baseline: dict) -> List[str]:
+    """Settings that differ between this run and a baseline (empty if comparable)
+
+    The benchmark selection may differ: compare() reports benchmarks only
+    in one of the two as new or missing.
+    """
+    previous = baseline.get("meta", {})
+    return [f"{key}: baseline {previous.get(key)!r}, now {value!r}"
+            for key, value in meta.items()
+            if key not in ("selection", "repeat", "warmup") and previous.get(key) != value]
+
+def save_baseline(path: str, results: List[BenchmarkResult], meta: dict) -> None:
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **meta,
+        },
+        "results": {result.name: asdict(result) for result in results},
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+def load_baseline(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def compare(results: List[BenchmarkResult], baseline: dict, threshold: float = 0.10) -> List[dict]:
+    """Compare median times with a baseline report
+
+    A benchmark regresses when its median time grew by more than threshold
+    (0.10 = 10%) and improves when it shrank by more than threshold.
+    """
+    previous: Dict[str, dict] = baseline.get("results", {})
+    rows = []
+    for result in results:
+        old = previous.get(result.name)
+        change: Optional[float] = None
+        if old is None:
+            status = "new"
+        else:
+            change = result.median / old["median"] - 1 if old["median"] else 0.0
+            if change > threshold:
+                status = "regression"
+            elif change < -threshold:
+                status = "improved"
+            else:
+                status = "ok"
+        rows.append({"name": result.name, "baseline": old["median"] if old else None,
+                     "current": result.median, "change": change, "status": status})
+    current_names = {result.name for result in results}
+    for name, old in previous.items():
+        if name not in current_names:
+            rows.append({"name": name, "baseline": old["median"], "current": None,
+                         "change": None, "status": "missing"})
+    return rows
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    lines = [f"{'benchmark':<26} {'median':>10} {'p10':>10} {'p90':>10} {'throughput':>18} {'peak':>10}"]
+    for result in results:
+        lines.append(f"{result.name:<26} {result.median * 1000:>8.2f}ms {result.p10 * 1000:>8.2f}ms "
+                     f"{result.p90 * 1000:>8.2f}ms {result.throughput:>12,.0f} {result.unit + '/s':<9}"
+                     f"{result.peak_kib:>7,.0f}KiB")
+    return "\n".join(lines)
+
+def format_comparison(rows: List[dict], threshold: float) -> str:
+    lines = [f"Compared with baseline (threshold {threshold:.0%}):"]
+    for row in rows:
+        change = f"{row['change']:+.1%}" if row["change"] is not None else "-"
+        lines.append(f"  {row['name']:<26} {change:>8}  {row['status']}")
+    return "\n".join(lines)
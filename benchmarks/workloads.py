@@ -0,0 +1,143 @@
+"""Seeded, scalable workloads for the hot paths of each module
+
+Every workload is a context manager factory ``setup(scale, seed)`` that
+yields a ``run()`` callable. ``run()`` does one timed unit of work and
+returns how many units (steps, nodes, queries, MB, frames) it processed.
+Setup work such as writing temp files happens outside the timing.
+"""
+
+import io
+import json
+import os
+import random
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, ContextManager, Dict, Iterator
+
+@dataclass
+class Workload:
+    name: str
+    unit: str
+    setup: Callable[[int, int], ContextManager[Callable[[], float]]]
+
+WORKLOADS: Dict[str, Workload] = {}
+
+def workload(name: str, unit: str):
+    """Register a generator function as a workload setup"""
+    def register(function):
+        WORKLOADS[name] = Workload(name, unit, contextmanager(function))
+        return function
+    return register
+
+def _agent_steps(size: int):
+    def setup(scale: int, seed: int) -> Iterator[Callable[[], float]]:
+        from simpleagent import ReflexAgent
+
+        rows = cols = size * scale
+
+        def run() -> float:
+            agent = ReflexAgent(grid_size=(rows, cols), obstacle_density=0.2, seed=seed, quiet=True)
+            agent.run_simulation(max_steps=rows * cols, delay=0, verbose=False)
+            return agent.steps_taken
+        yield run
+    return setup
+
+# Agent steps/sec as the grid grows
+for _size in (16, 32, 64):
+    workload(f"agent.steps.{_size}", "steps")(_agent_steps(_size))
+
+@workload("tictactoe.minimax_nodes", "nodes")
+def _minimax_nodes(scale: int, seed: int) -> Iterator[Callable[[], float]]:
+    import tic_tok_toe as ttt
+
+    def run() -> float:
+        ttt.search_stats["nodes"] = 0
+        for _ in range(scale):
+            ttt.minimax_bits(0, 0, True)
+        return ttt.search_stats["nodes"]
+    yield run
+
+@workload("tictactoe.move_latency", "moves")
+def _move_latency(scale: int, seed: int) -> Iterator[Callable[[], float]]:
+    import tic_tok_toe as ttt
+
+    rng = random.Random(seed)
+    # Seeded openings: empty, or one X and one O, with X to move
+    boards = []
+    for _ in range(8 * scale):
+        board = [[" "] * 3 for _ in range(3)]
+        for index, square in enumerate(rng.sample(range(9), rng.choice((0, 2)))):
+            board[square // 3][square % 3] = "X" if index % 2 == 0 else "O"
+        boards.append(board)
+
+    def run() -> float:
+        for board in boards:
+            ttt.transposition_table.clear()  # cold search every time
+            ttt.find_best_move(board, engine="alphabeta")
+        return len(boards)
+    yield run
+
+@workload("probability.queries", "queries")
+def _probability_queries(scale: int, seed: int) -> Iterator[Callable[[], float]]:
+    from probability_service import ResultCache, run_queries
+
+    rng = random.Random(seed)
+    lines = []
+    for index in range(200 * scale):
+        dice, draw = rng.randint(1, 40), rng.randint(1, 13)
+        event = {"or": [{"of": "d", "aggregate": "total", "op": ">=", "value": rng.randint(dice, 6 * dice)},
+                        {"of": "h", "aggregate": "count", "suit": rng.choice(["Hearts", "Spades"]),
+                         "op": ">=", "value": rng.randint(0, draw)}]}
+        lines.append(json.dumps({"id": index, "components": {"d": {"dice": dice}, "h": {"draw": draw}},
+                                 "event": event}))
+
+    def run() -> float:
+        cache = ResultCache()  # fresh cache: measure evaluation, not lookups
+        return sum(1 for _ in run_queries(lines, cache))
+    yield run
+
+@workload("grid.scan", "MB")
+def _grid_scan(scale: int, seed: int) -> Iterator[Callable[[], float]]:
+    from start_task_grid import scan_grid_file
+
+    rng = random.Random(seed)
+    cols, rows = 1023, 32 * 1024 * scale
+    lines = [''.join(rng.choice('.......#') for _ in range(cols)).encode() + b"\n" for _ in range(64)]
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(fd, "wb") as f:
+        for row in range(rows):
+            line = lines[row % len(lines)]
+            if row % 97 == 0:
+                position = rng.randrange(cols)
+                line = line[:position] + b"T" + line[position + 1:]
+            f.write(line)
+    megabytes = os.path.getsize(path) / 1e6
+
+    def run() -> float:
+        for _ in scan_grid_file(path):
+            pass
+        return megabytes
+    try:
+        yield run
+    finally:
+        os.remove(path)
+
+@workload("grid.render", "frames")
+def _grid_render(scale: int, seed: int) -> Iterator[Callable[[], float]]:
+    from grid_store import CharGrid
+    from simple_grid import print_grid
+
+    rng = random.Random(seed)
+    rows, cols = 1000 * scale, 1000 * scale
+    grid = CharGrid(rows, cols)
+    for _ in range(rows * cols // 20):
+        grid.set(rng.randrange(rows), rng.randrange(cols), '#')
+    viewports = [(rng.randrange(rows - 40), rng.randrange(cols - 120)) for _ in range(500)]
+
+    def run() -> float:
+        stream = io.StringIO()
+        for top, left in viewports:
+            print_grid(grid, top=top, left=left, height=40, width=120, stream=stream)
+        return len(viewports)
+    yield run
@@ -0,0 +1,150 @@
+import os
+import random
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from simpleagent import CELL_TYPES, CellType, ReflexAgent
+
+class ChunkedWorld:
+    """Lazily generated grid split into square chunks
+
+    Each chunk is generated from (seed, chunk_row, chunk_col) the first time
+    one of its cells is read, so the same seed always yields the same world
+    and untouched chunks never need to be stored. At most max_chunks chunks
+    stay in memory (least recently used first out). Clean chunks are simply
+    dropped and regenerated later; chunks that were changed (collected
+    goals, agent moves) are spilled to disk and reloaded on next access.
+
+    It offers the same get/set/row interface as simpleagent.ByteGrid and
+    plugs into an agent with ReflexAgent(..., world=ChunkedWorld(...)).
+    """
+
+    def __init__(self, rows: int, cols: int, obstacle_density: float = 0.2, goal_density: float = 0.05,
+                 seed: int = 0, chunk_size: int = 64, max_chunks: int = 256,
+                 spill_dir: Optional[str] = None, start: Tuple[int, int] = (0, 0)):
+        self.rows = rows
+        self.cols = cols
+        self.obstacle_density = obstacle_density
+        self.goal_density = goal_density
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.start = start
+
+        self.chunks: "OrderedDict[Tuple[int, int], bytearray]" = OrderedDict()
+        self.dirty = set()    # resident chunks changed since they were loaded
+        self.spilled = set()  # chunks whose current contents live on disk
+        self.spill_dir = spill_dir
+        self._owns_spill_dir = spill_dir is None
+        self.generated_count = 0
+
+    def _generate_chunk(self, key: Tuple[int, int]) -> bytearray:
+        """Build a chunk's cells from the world seed and its coordinates"""
+        chunk_row, chunk_col = key
+        rng = random.Random(f"{self.seed}:{chunk_row}:{chunk_col}")
+        size = self.chunk_size
+        cells = bytearray(size * size)
+        obstacle, goal = self.obstacle_density, self.obstacle_density + self.goal_density
+        for index in range(size * size):
+            roll = rng.random()
+            if roll < obstacle:
+                cells[index] = CellType.OBSTACLE.value
+            elif roll < goal:
+                cells[index] = CellType.GOAL.value
+
+        # Keep the start cell free
+        start_row, start_col = self.start
+        if (start_row // size, start_col // size) == key:
+            cells[(start_row % size) * size + start_col % size] = CellType.EMPTY.value
+        self.generated_count += 1
+        return cells
+
+    def _spill_path(self, key: Tuple[int, int]) -> str:
+        return os.path.join(self.spill_dir, f"chunk_{key[0]}_{key[1]}.bin")
+
+    def _chunk(self, key: Tuple[int, int]) -> bytearray:
+        """Return a resident chunk, loading or generating it if needed"""
+        cells = self.chunks.get(key)
+        if cells is not None:
+            self.chunks.move_to_end(key)
+            return cells
+
+        if key in self.spilled:
+            with open(self._spill_path(key), "rb") as f:
+                cells = bytearray(f.read())
+        else:
+            cells = self._generate_chunk(key)
+        self.chunks[key] = cells
+        if len(self.chunks) > self.max_chunks:
+            self._evict()
+        return cells
+
+    def _evict(self):
+        """Drop the least recently used chunk, spilling it if it changed"""
+        key, cells = self.chunks.popitem(last=False)
+        if key in self.dirty:
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix="chunked_world_")
+            with open(self._spill_path(key), "wb") as f:
+                f.write(cells)
+            self.dirty.discard(key)
+            self.spilled.add(key)
+
+    def get(self, row: int, col: int) -> CellType:
+        size = self.chunk_size
+        cells = self._chunk((row // size, col // size))
+        return CELL_TYPES[cells[(row % size) * size + col % size]]
+
+    def set(self, row: int, col: int, cell: CellType):
+        size = self.chunk_size
+        key = (row // size, col // size)
+        self._chunk(key)[(row % size) * size + col % size] = cell.value
+        self.dirty.add(key)
+
+    def row(self, row: int) -> List[CellType]:
+        return [self.get(row, col) for col in range(self.cols)]
+
+    def window(self, top: int, left: int, height: int, width: int) -> List[List[CellType]]:
+        """Cells of a rectangular region, clipped to the world bounds"""
+        bottom, right = min(top + height, self.rows), min(left + width, self.cols)
+        return [[self.get(row, col) for col in range(left, right)] for row in range(top, bottom)]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'resident_chunks': len(self.chunks),
+            'dirty_chunks': len(self.dirty),
+            'spilled_chunks': len(self.spilled),
+            'chunks_generated': self.generated_count,
+            'resident_bytes': len(self.chunks) * self.chunk_size * self.chunk_size,
+        }
+
+    def close(self):
+        """Forget all chunks and remove the spill directory if we created it"""
+        self.chunks.clear()
+        self.dirty.clear()
+        self.spilled.clear()
+        if self._owns_spill_dir and self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+# Example usage and demonstration
+if __name__ == "__main__":
+    print("=== Reflex Agent on a Chunked World ===")
+
+    # A billion-by-billion world: only the chunks the agent visits exist
+    with ChunkedWorld(10**9, 10**9, obstacle_density=0.2, seed=42, chunk_size=32, max_chunks=16) as world:
+        agent = ReflexAgent(grid_size=(world.rows, world.cols), world=world, seed=42, quiet=True)
+        agent.run_simulation(max_steps=200000, verbose=False)
+
+        print(f"Steps taken: {agent.steps_taken}")
+        print(f"Goals collected: {agent.goals_collected}")
+        print(f"Final position: {agent.position}")
+        print(f"World: {world.stats()}")
@@ -0,0 +1,235 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from bisect import bisect_right
+from collections import Counter, namedtuple
+from typing import Dict, Iterator, List, Tuple
+
+from simpleagent import CELL_SYMBOLS, CELL_TYPES, DIRECTION_OFFSETS, CellType, ReflexAgent
+
+# File layout: header, initial grid (one CellType value per cell,
+# row-major), then one fixed-width record per step.
+MAGIC = b"RATR"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIII")   # magic, version, record size, rows, cols, start row, start col
+RECORD = struct.Struct("<IIIBBxx")    # step, row, col, action, event (16 bytes)
+
+# Action codes: 0 = stay, then 1 + index into DIRECTION_OFFSETS
+ACTION_STAY = 0
+ACTION_CODES = {offset: code for code, offset in enumerate(DIRECTION_OFFSETS, start=1)}
+ACTION_NAMES = ["STAY", "UP", "DOWN", "LEFT", "RIGHT"]
+
+# Event codes
+EVENT_NONE = 0
+EVENT_GOAL_COLLECTED = 1
+
+StepRecord = namedtuple("StepRecord", ["step", "row", "col", "action", "event"])
+
+class TraceRecorder:
+    """Append one fixed-width binary record per simulation step
+
+    Pass it to ReflexAgent.run_simulation(recorder=...). The initial grid is
+    written once when the run starts; step records are packed into an
+    in-memory buffer and written out every buffer_records steps.
+    """
+
+    def __init__(self, path: str, buffer_records: int = 4096):
+        self.path = path
+        self.buffer_records = buffer_records
+        self.file = None
+        self.buffer = bytearray()
+        self.pending = 0
+        self.records_written = 0
+
+    def start(self, agent: ReflexAgent):
+        """Open the trace file and store the header and initial grid"""
+        self.file = open(self.path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, agent.rows, agent.cols,
+                                    agent.position[0], agent.position[1]))
+        if agent.storage == "bytearray":
+            self.file.write(agent.grid.cells)
+        else:
+            for row in agent._grid_rows():
+                self.file.write(bytes(cell.value for cell in row))
+
+    def record(self, agent: ReflexAgent, old_position: Tuple[int, int], collected: bool):
+        """Store the step the agent just took from old_position"""
+        row, col = agent.position
+        action = ACTION_CODES.get((row - old_position[0], col - old_position[1]), ACTION_STAY)
+        event = EVENT_GOAL_COLLECTED if collected else EVENT_NONE
+        self.buffer += RECORD.pack(agent.steps_taken, row, col, action, event)
+        self.pending += 1
+        if self.pending >= self.buffer_records:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.records_written += self.pending
+            self.buffer.clear()
+            self.pending = 0
+
+    def close(self):
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+class TraceReplay:
+    """Memory-mapped, random-access view of a recorded episode
+
+    Records are read straight from the mapped file, so seeking to a step or
+    computing aggregates never loads the whole trace. Grid states are
+    rebuilt from the nearest cached checkpoint plus the steps after it, and
+    a new checkpoint is kept every checkpoint_interval steps replayed. A
+    checkpoint only stores the cells that differ from the initial grid (the
+    agent and collected goals), so checkpoints stay small on large grids.
+    """
+
+    def __init__(self, path: str, checkpoint_interval: int = 10000):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, self.rows, self.cols, start_row, start_col = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise ValueError(f"{path} is not a version {VERSION} episode trace")
+        self.start = (start_row, start_col)
+        self.grid_offset = HEADER.size
+        self.records_offset = self.grid_offset + self.rows * self.cols
+        self.num_records = (len(self.map) - self.records_offset) // RECORD.size
+
+        self.checkpoint_interval = checkpoint_interval
+        # step -> (flat index -> value of cells differing from the initial grid, position)
+        self.checkpoints: Dict[int, Tuple[Dict[int, int], Tuple[int, int]]] = {}
+        self.checkpoint_steps: List[int] = []
+
+        # All records, unpacked on demand with the little-endian RECORD layout
+        self.records = memoryview(self.map)[self.records_offset:
+                                            self.records_offset + self.num_records * RECORD.size]
+
+    def __len__(self) -> int:
+        return self.num_records
+
+    def __getitem__(self, index: int) -> StepRecord:
+        """Record of step index + 1 (records are stored in step order)"""
+        if index < 0:
+            index += self.num_records
+        if not 0 <= index < self.num_records:
+            raise IndexError("step record out of range")
+        return StepRecord(*RECORD.unpack_from(self.map, self.records_offset + index * RECORD.size))
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int, int, int]]:
+        """(step, row, col, action, event) of every record, in step order"""
+        return RECORD.iter_unpack(self.records)
+
+    def initial_grid(self) -> bytearray:
+        return bytearray(self.map[self.grid_offset:self.records_offset])
+
+    def _checkpoint_before(self, step: int) -> Tuple[int, Dict[int, int], Tuple[int, int]]:
+        """Latest cached state at or before step (step 0 is the initial grid)"""
+        index = bisect_right(self.checkpoint_steps, step)
+        if index == 0:
+            return 0, {}, self.start
+        found = self.checkpoint_steps[index - 1]
+        changes, position = self.checkpoints[found]
+        return found, dict(changes), position
+
+    def cells_at(self, step: int) -> Tuple[bytearray, Tuple[int, int]]:
+        """Flat cell values and agent position after the given step"""
+        step = max(0, min(step, self.num_records))
+        current, changes, position = self._checkpoint_before(step)
+        cells = self.initial_grid()
+        for index, value in changes.items():
+            cells[index] = value
+        initial, grid_offset = self.map, self.grid_offset
+
+        def put(index, value):
+            cells[index] = value
+            if initial[grid_offset + index] == value:
+                changes.pop(index, None)
+            else:
+                changes[index] = value
+
+        agent, collected = CellType.AGENT.value, CellType.COLLECTED.value
+        for index in range(current, step):
+            record = self[index]
+            new_position = (record.row, record.col)
+            # Same cell updates as ReflexAgent._execute_action
+            if new_position == position:
+                if record.event == EVENT_GOAL_COLLECTED:
+                    put(position[0] * self.cols + position[1], collected)
+            else:
+                old_index = position[0] * self.cols + position[1]
+                if cells[old_index] == agent:
+                    put(old_index, CellType.EMPTY.value)
+                put(record.row * self.cols + record.col, agent)
+                position = new_position
+            if record.step % self.checkpoint_interval == 0 and record.step not in self.checkpoints:
+                self.checkpoints[record.step] = (dict(changes), position)
+                self.checkpoint_steps.insert(bisect_right(self.checkpoint_steps, record.step), record.step)
+        return cells, position
+
+    def grid_at(self, step: int) -> List[List[CellType]]:
+        """Grid after the given step, as rows of CellType"""
+        cells, _ = self.cells_at(step)
+        return [[CELL_TYPES[value] for value in cells[row * self.cols:(row + 1) * self.cols]]
+                for row in range(self.rows)]
+
+    def visit_heatmap(self) -> Counter:
+        """Number of steps that ended on each (row, col)"""
+        return Counter((row, col) for _, row, col, _, _ in self)
+
+    def revisit_rate(self) -> float:
+        """Share of steps that ended on a cell the agent had already been on"""
+        if not self.num_records:
+            return 0.0
+        visited = {(row, col) for _, row, col, _, _ in self}
+        visited.add(self.start)
+        return 1 - (len(visited) - 1) / self.num_records
+
+    def summary(self) -> dict:
+        goals = stays = 0
+        for _, _, _, action, event in self:
+            goals += event == EVENT_GOAL_COLLECTED
+            stays += action == ACTION_STAY
+        return {
+            'steps': self.num_records,
+            'goals_collected': goals,
+            'stays': stays,
+            'cells_visited': len(self.visit_heatmap()),
+            'revisit_rate': self.revisit_rate(),
+        }
+
+    def close(self):
+        self.records.release()
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def demo(path: str):
+    agent = ReflexAgent(grid_size=(20, 20), obstacle_density=0.15, seed=3, quiet=True)
+    agent.run_simulation(max_steps=5000, verbose=False, recorder=TraceRecorder(path))
+
+    with TraceReplay(path, checkpoint_interval=500) as replay:
+        print(f"Summary: {replay.summary()}")
+        print(f"Step 10: {replay[9]}")
+        print(f"\nGrid after step {len(replay) // 2}:")
+        for row in replay.grid_at(len(replay) // 2):
+            print(" ".join(CELL_SYMBOLS[cell] for cell in row))
+
+# Example usage and demonstration: python episode_trace.py [trace path]
+# (without a path the trace goes to a temporary directory and is removed)
+if __name__ == "__main__":
+    print("=== Recording and Replaying an Episode ===")
+
+    if len(sys.argv) > 1:
+        demo(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            demo(os.path.join(directory, "episode.trace"))
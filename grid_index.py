@@ -0,0 +1,209 @@
+# Reusable spatial index over the special cells of an ASCII grid ('S', 'T'
+# or any other marker), for asking many questions of one map: which tasks
+# are inside a rectangle, the k nearest tasks to a point, how many tasks a
+# region holds. Cells can be added and removed as the map changes.
+
+import heapq
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+Cell = Tuple[int, int]
+
+class FenwickGrid:
+    """2-D Fenwick tree: point updates and rectangle sums in O(log rows * log cols)"""
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.tree = [[0] * (cols + 1) for _ in range(rows + 1)]
+
+    def add(self, row: int, col: int, delta: int) -> None:
+        i = row + 1
+        while i <= self.rows:
+            tree_row = self.tree[i]
+            j = col + 1
+            while j <= self.cols:
+                tree_row[j] += delta
+                j += j & -j
+            i += i & -i
+
+    def prefix(self, row: int, col: int) -> int:
+        """Sum over rows [0, row) and columns [0, col)"""
+        total = 0
+        i = min(row, self.rows)
+        while i > 0:
+            tree_row = self.tree[i]
+            j = min(col, self.cols)
+            while j > 0:
+                total += tree_row[j]
+                j -= j & -j
+            i -= i & -i
+        return total
+
+    def rect(self, top: int, left: int, bottom: int, right: int) -> int:
+        """Sum over the inclusive rectangle (top, left) - (bottom, right)"""
+        top, left = max(top, 0), max(left, 0)
+        if bottom < top or right < left:
+            return 0
+        return (self.prefix(bottom + 1, right + 1) - self.prefix(top, right + 1)
+                - self.prefix(bottom + 1, left) + self.prefix(top, left))
+
+class GridIndex:
+    """Index of marker cells in uniform square buckets plus count tables
+
+    Each marker gets a dict of buckets (bucket_size x bucket_size blocks of
+    the grid) holding its cells, used for rectangle and nearest-neighbour
+    queries that only visit nearby buckets, and a Fenwick tree for counts
+    in any rectangle. Nearest uses Manhattan distance (grid steps,
+    ignoring walls).
+    """
+
+    def __init__(self, grid: Iterable[str], markers: str = "ST", bucket_size: int = 16):
+        grid = list(grid)
+        self.rows = len(grid)
+        self.cols = max((len(row) for row in grid), default=0)
+        self.markers = markers
+        self.bucket_size = bucket_size
+        self.buckets: Dict[str, Dict[Cell, Set[Cell]]] = {marker: {} for marker in markers}
+        self.counts = {marker: FenwickGrid(self.rows, self.cols) for marker in markers}
+        self.marker_at: Dict[Cell, str] = {}
+        for r, row in enumerate(grid):
+            for marker in markers:
+                c = row.find(marker)
+                while c != -1:
+                    self.insert(marker, (r, c))
+                    c = row.find(marker, c + 1)
+
+    def _bucket(self, cell: Cell) -> Cell:
+        return cell[0] // self.bucket_size, cell[1] // self.bucket_size
+
+    # --- Updates ---
+
+    def insert(self, marker: str, cell: Cell) -> None:
+        """Add a marker cell, replacing whatever marker the cell had"""
+        if marker not in self.buckets:
+            raise ValueError(f"marker {marker!r} is not indexed (indexed: {self.markers!r})")
+        if not (0 <= cell[0] < self.rows and 0 <= cell[1] < self.cols):
+            raise ValueError(f"cell {cell} is outside the {self.rows}x{self.cols} grid")
+        current = self.marker_at.get(cell)
+        if current == marker:
+            return
+        if current is not None:
+            self.remove(cell)
+        self.buckets[marker].setdefault(self._bucket(cell), set()).add(cell)
+        self.counts[marker].add(cell[0], cell[1], 1)
+        self.marker_at[cell] = marker
+
+    def remove(self, cell: Cell) -> Optional[str]:
+        """Drop a cell from the index; returns its marker (None if not indexed)"""
+        marker = self.marker_at.pop(cell, None)
+        if marker is None:
+            return None
+        key = self._bucket(cell)
+        bucket = self.buckets[marker][key]
+        bucket.discard(cell)
+        if not bucket:
+            del self.buckets[marker][key]
+        self.counts[marker].add(cell[0], cell[1], -1)
+        return marker
+
+    def set_cell(self, cell: Cell, char: str) -> None:
+        """Keep the index in step with grid[row][col] = char"""
+        if char in self.buckets:
+            self.insert(char, cell)
+        else:
+            self.remove(cell)
+
+    # --- Queries ---
+
+    def count(self, marker: str, top: int = 0, left: int = 0,
+              bottom: Optional[int] = None, right: Optional[int] = None) -> int:
+        """Number of marker cells in the inclusive rectangle (whole grid by default)"""
+        bottom = self.rows - 1 if bottom is None else bottom
+        right = self.cols - 1 if right is None else right
+        return self.counts[marker].rect(top, left, bottom, right)
+
+    def in_rect(self, marker: str, top: int, left: int, bottom: int, right: int) -> List[Cell]:
+        """Marker cells in the inclusive rectangle, sorted by (row, col)"""
+        buckets = self.buckets[marker]
+        size = self.bucket_size
+        found = []
+        for br in range(max(top, 0) // size, min(bottom, self.rows - 1) // size + 1):
+            for bc in range(max(left, 0) // size, min(right, self.cols - 1) // size + 1):
+                bucket = buckets.get((br, bc))
+                if not bucket:
+                    continue
+                inside_rows = top <= br * size and (br + 1) * size - 1 <= bottom
+                inside_cols = left <= bc * size and (bc + 1) * size - 1 <= right
+                if inside_rows and inside_cols:
+                    found.extend(bucket)
+                else:
+                    found.extend(cell for cell in bucket
+                                 if top <= cell[0] <= bottom and left <= cell[1] <= right)
+        found.sort()
+        return found
+
+    def nearest(self, marker: str, point: Cell, k: int = 1) -> List[Tuple[int, Cell]]:
+        """The k marker cells closest to point as (distance, cell), closest first
+
+        Buckets are visited in square rings around the point's bucket. Every
+        cell in ring d is at least (d - 1) * bucket_size + 1 steps away, so
+        the search stops once the k-th best distance is below that bound
+        for the next ring.
+        """
+        buckets = self.buckets[marker]
+        if k <= 0 or not buckets:
+            return []
+        size = self.bucket_size
+        pr, pc = point
+        center_r, center_c = self._bucket(point)
+        max_ring = max(center_r, center_c,
+                       (self.rows - 1) // size - center_r, (self.cols - 1) // size - center_c)
+        best: List[Tuple[int, int, int]] = []  # max-heap of (-distance, -row, -col)
+        for ring in range(max_ring + 1):
+            if len(best) == k and -best[0][0] <= ring * size - size:
+                break
+            for br in range(center_r - ring, center_r + ring + 1):
+                edge = br in (center_r - ring, center_r + ring)
+                step = 1 if edge else 2 * ring
+                for bc in range(center_c - ring, center_c + ring + 1, step or 1):
+                    for r, c in buckets.get((br, bc), ()):
+                        entry = (-(abs(r - pr) + abs(c - pc)), -r, -c)
+                        if len(best) < k:
+                            heapq.heappush(best, entry)
+                        elif entry > best[0]:
+                            heapq.heapreplace(best, entry)
+        return sorted((-distance, (-r, -c)) for distance, r, c in best)
+
+# --- Demo: build an index over a large random map and time some queries ---
+if __name__ == "__main__":
+    rows, cols = 2000, 2000
+    rng = random.Random(0)
+    grid = [''.join('T' if rng.random() < 0.01 else '.' for _ in range(cols)) for _ in range(rows)]
+
+    start = time.perf_counter()
+    index = GridIndex(grid)
+    print(f"Indexed {index.count('T')} tasks on {rows}x{cols} in {time.perf_counter() - start:.2f}s")
+
+    queries = [(rng.randrange(rows), rng.randrange(cols)) for _ in range(1000)]
+    start = time.perf_counter()
+    for r, c in queries:
+        index.nearest('T', (r, c), k=5)
+    print(f"5-nearest: {(time.perf_counter() - start) / len(queries) * 1e6:.0f} us/query")
+
+    start = time.perf_counter()
+    for r, c in queries:
+        index.count('T', r, c, r + 199, c + 199)
+    print(f"Rectangle count: {(time.perf_counter() - start) / len(queries) * 1e6:.0f} us/query")
+
+    start = time.perf_counter()
+    for r, c in queries:
+        index.in_rect('T', r, c, r + 49, c + 49)
+    print(f"Rectangle listing: {(time.perf_counter() - start) / len(queries) * 1e6:.0f} us/query")
+
+    start = time.perf_counter()
+    for r, c in queries:
+        index.set_cell((r, c), 'T')
+        index.set_cell((r, c), '.')
+    print(f"Insert + remove: {(time.perf_counter() - start) / len(queries) * 1e6:.0f} us/pair")
@@ -0,0 +1,133 @@
+import io
+import shutil
+import sys
+import time
+from typing import Optional, Tuple
+
+from simpleagent import CELL_SYMBOLS, ReflexAgent
+
+# ANSI escape sequences
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+CLEAR_LINE = "\x1b[K"
+HIDE_CURSOR = "\x1b[?25l"
+SHOW_CURSOR = "\x1b[?25h"
+
+def move_cursor(line: int, column: int) -> str:
+    """ANSI cursor move to a 1-based screen line and column"""
+    return f"\x1b[{line};{column}H"
+
+class TerminalRenderer:
+    """Live ANSI renderer for a ReflexAgent grid
+
+    The first frame (and any frame after the viewport scrolls) is drawn in
+    full. Every later frame only moves the cursor to the cells the agent
+    changed since the last frame and rewrites those, plus the status line.
+    Each frame goes out as one buffered write.
+
+    The viewport follows the agent on grids bigger than the terminal, and
+    max_fps caps how often frames are drawn: render() calls in between
+    return immediately, so the simulation is never slowed to display speed.
+    """
+
+    # Screen layout: status line, top border, then one line per grid row
+    STATUS_LINE = 1
+    FIRST_ROW_LINE = 3
+
+    def __init__(self, stream=None, viewport: Optional[Tuple[int, int]] = None,
+                 max_fps: float = 30.0, margin: int = 2):
+        self.stream = stream if stream is not None else sys.stdout
+        if viewport is None:
+            size = shutil.get_terminal_size()
+            viewport = (max(1, size.lines - 4), max(1, (size.columns - 2) // 2))
+        self.viewport_rows, self.viewport_cols = viewport
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.margin = margin
+
+        self.top = 0
+        self.left = 0
+        self.last_frame_time = None
+        self.needs_full_redraw = True
+        self.frames_drawn = 0
+        self.bytes_written = 0
+
+    def _follow(self, agent: ReflexAgent) -> bool:
+        """Scroll the viewport to keep the agent in view; True if it moved"""
+        height = min(self.viewport_rows, agent.rows)
+        width = min(self.viewport_cols, agent.cols)
+        margin_rows = min(self.margin, height // 2)
+        margin_cols = min(self.margin, width // 2)
+        row, col = agent.position
+        top, left = self.top, self.left
+
+        if not top + margin_rows <= row < top + height - margin_rows:
+            top = min(max(0, row - height // 2), agent.rows - height)
+        if not left + margin_cols <= col < left + width - margin_cols:
+            left = min(max(0, col - width // 2), agent.cols - width)
+
+        moved = (top, left) != (self.top, self.left)
+        self.top, self.left = top, left
+        return moved
+
+    def _status(self, agent: ReflexAgent) -> str:
+        return (f"Step {agent.steps_taken} - Goals collected: {agent.goals_collected} - "
+                f"Position {agent.position} - View ({self.top}, {self.left})")
+
+    def _draw_full(self, agent: ReflexAgent, frame: io.StringIO):
+        height = min(self.viewport_rows, agent.rows)
+        width = min(self.viewport_cols, agent.cols)
+        frame.write(CLEAR_SCREEN)
+        frame.write(self._status(agent) + "\n")
+        frame.write("+" + "-" * (width * 2 - 1) + "+\n")
+        for row in range(self.top, self.top + height):
+            cells = (CELL_SYMBOLS[agent._get_cell((row, col))] for col in range(self.left, self.left + width))
+            frame.write("|" + " ".join(cells) + "|\n")
+        frame.write("+" + "-" * (width * 2 - 1) + "+\n")
+        frame.write("Legend: A=Agent, G=Goal, #=Obstacle, X=Collected, .=Empty\n")
+
+    def _draw_changes(self, agent: ReflexAgent, frame: io.StringIO):
+        height = min(self.viewport_rows, agent.rows)
+        width = min(self.viewport_cols, agent.cols)
+        for row, col in agent.changed_cells:
+            if self.top <= row < self.top + height and self.left <= col < self.left + width:
+                line = self.FIRST_ROW_LINE + row - self.top
+                column = 2 + 2 * (col - self.left)
+                frame.write(move_cursor(line, column) + CELL_SYMBOLS[agent._get_cell((row, col))])
+        frame.write(move_cursor(self.STATUS_LINE, 1) + self._status(agent) + CLEAR_LINE)
+        # Park the cursor below the grid
+        frame.write(move_cursor(self.FIRST_ROW_LINE + height + 2, 1))
+
+    def render(self, agent: ReflexAgent, force: bool = False) -> bool:
+        """Draw a frame if the frame-rate cap allows it; True if drawn"""
+        now = time.perf_counter()
+        if (not force and self.last_frame_time is not None
+                and now - self.last_frame_time < self.min_interval):
+            return False
+
+        frame = io.StringIO()
+        if self._follow(agent) or self.needs_full_redraw or agent.changed_cells is None:
+            if self.frames_drawn == 0:
+                frame.write(HIDE_CURSOR)
+            self._draw_full(agent, frame)
+            self.needs_full_redraw = False
+        else:
+            self._draw_changes(agent, frame)
+        agent.changed_cells = set()
+
+        text = frame.getvalue()
+        self.stream.write(text)
+        self.stream.flush()
+        self.bytes_written += len(text)
+        self.frames_drawn += 1
+        self.last_frame_time = now
+        return True
+
+    def close(self):
+        """Restore the cursor; the next frame will be a full redraw"""
+        self.stream.write(SHOW_CURSOR + "\n")
+        self.stream.flush()
+        self.needs_full_redraw = True
+
+# Example usage and demonstration
+if __name__ == "__main__":
+    agent = ReflexAgent(grid_size=(200, 200), obstacle_density=0.2, storage="bytearray", seed=1)
+    agent.run_simulation(max_steps=20000, renderer=TerminalRenderer(max_fps=20))
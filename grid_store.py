@@ -0,0 +1,199 @@
+# Compact character grid container: one contiguous row-major byte buffer
+# with a fixed width, saved as a small binary header followed by either the
+# raw cells (which large files are memory-mapped from, so rows and windows
+# are zero-copy views) or run-length encoded cells (smaller on disk).
+
+import mmap
+import re
+import struct
+import sys
+import time
+
+GRID_MAGIC = b"GRID"
+GRID_VERSION = 1
+GRID_HEADER = struct.Struct("<4sHHQQ")  # magic, version, encoding, rows, cols
+RLE_RUN = struct.Struct("<BI")           # cell byte, run length
+ENCODINGS = {"raw": 0, "rle": 1}
+
+# Longest run a single RLE record can hold
+MAX_RUN = 0xFFFFFFFF
+
+class CharGrid:
+    """rows x cols grid of one-byte characters in a single buffer
+
+    Cell (r, c) is byte r * cols + c. Buffers come from memory (new grids,
+    from_rows, RLE files) or from a memory-mapped raw file (open), in which
+    case row() and window() are views straight into the file.
+    """
+
+    def __init__(self, rows, cols, fill=".", data=None):
+        self.rows = rows
+        self.cols = cols
+        if data is None:
+            data = bytearray(_cell_byte(fill) * (rows * cols))
+        if len(data) != rows * cols:
+            raise ValueError(f"expected {rows * cols} cells, got {len(data)}")
+        self.data = memoryview(data)
+        self._mmap = None
+        self._file = None
+
+    @classmethod
+    def from_rows(cls, grid):
+        """Grid from a list of strings or a list of lists of characters"""
+        rows = [''.join(row) for row in grid]
+        for row in rows:
+            if not row.isascii():
+                raise ValueError(f"grid cells must be ASCII characters, got row {row!r}")
+        cols = max((len(row) for row in rows), default=0)
+        data = bytearray(''.join(row.ljust(cols) for row in rows).encode())
+        return cls(len(rows), cols, data=data)
+
+    @classmethod
+    def create(cls, path, rows, cols, fill=".", block_rows=4096):
+        """Write a new raw grid file filled with one character and open it writable"""
+        with open(path, "wb") as f:
+            f.write(GRID_HEADER.pack(GRID_MAGIC, GRID_VERSION, ENCODINGS["raw"], rows, cols))
+            block = _cell_byte(fill) * (cols * min(rows, block_rows))
+            written = 0
+            while written < rows:
+                count = min(block_rows, rows - written)
+                f.write(block[:count * cols])
+                written += count
+        return cls.open(path, writable=True)
+
+    @classmethod
+    def open(cls, path, writable=False):
+        """Load a grid file; raw files are memory-mapped, RLE files decoded"""
+        f = open(path, "r+b" if writable else "rb")
+        header = f.read(GRID_HEADER.size)
+        if len(header) < GRID_HEADER.size:
+            f.close()
+            raise ValueError(f"{path} is not a grid file")
+        magic, version, encoding, rows, cols = GRID_HEADER.unpack(header)
+        if magic != GRID_MAGIC or version != GRID_VERSION:
+            f.close()
+            raise ValueError(f"{path} is not a version {GRID_VERSION} grid file")
+
+        if encoding == ENCODINGS["rle"]:
+            if writable:
+                f.close()
+                raise ValueError(f"{path} is run-length encoded and can't be opened writable; "
+                                 f"load it and save() a raw copy instead")
+            data = _decode_rle(f.read(), rows * cols)
+            f.close()
+            return cls(rows, cols, data=data)
+        if encoding != ENCODINGS["raw"]:
+            f.close()
+            raise ValueError(f"{path} has unknown encoding {encoding}")
+
+        if rows * cols == 0:
+            f.close()
+            return cls(rows, cols, data=bytearray())
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        grid = cls.__new__(cls)
+        grid.rows, grid.cols = rows, cols
+        grid.data = memoryview(mapped)[GRID_HEADER.size:GRID_HEADER.size + rows * cols]
+        grid._mmap, grid._file = mapped, f
+        return grid
+
+    def save(self, path, encoding="raw"):
+        with open(path, "wb") as f:
+            f.write(GRID_HEADER.pack(GRID_MAGIC, GRID_VERSION, ENCODINGS[encoding], self.rows, self.cols))
+            if encoding == "rle":
+                f.write(_encode_rle(self.data))
+            else:
+                f.write(self.data)
+
+    def close(self):
+        """Close the grid file; the grid can't be used afterwards
+
+        Views from row()/window() that are still referenced keep the mapping
+        alive, so it is unmapped when the last of them is dropped.
+        """
+        if self._mmap is None:
+            return
+        mapped, f = self._mmap, self._file
+        self._mmap = self._file = None
+        data, self.data = self.data, memoryview(b"")
+        try:
+            data.release()
+            mapped.close()
+        except BufferError:
+            pass  # exported views still alive; freed with them
+        finally:
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, row, col):
+        return chr(self.data[row * self.cols + col])
+
+    def set(self, row, col, char):
+        self.data[row * self.cols + col] = ord(char)
+
+    def row(self, row):
+        """Zero-copy view of one row's bytes"""
+        start = row * self.cols
+        return self.data[start:start + self.cols]
+
+    def window(self, top, left, height, width):
+        """Zero-copy views of the rows of a window, clipped to the grid"""
+        top, left = max(top, 0), max(left, 0)
+        bottom, right = min(top + height, self.rows), min(left + width, self.cols)
+        return [self.data[r * self.cols + left:r * self.cols + right] for r in range(top, bottom)]
+
+    def to_rows(self):
+        """The grid as a list of strings"""
+        return [bytes(self.row(r)).decode() for r in range(self.rows)]
+
+def _cell_byte(char):
+    if len(char) != 1 or not char.isascii():
+        raise ValueError(f"grid cells must be single ASCII characters, got {char!r}")
+    return char.encode()
+
+def _encode_rle(data):
+    out = bytearray()
+    for match in re.finditer(rb"(.)\1*", bytes(data), re.DOTALL):
+        value, length = match.group(1)[0], match.end() - match.start()
+        while length:
+            run = min(length, MAX_RUN)
+            out += RLE_RUN.pack(value, run)
+            length -= run
+    return bytes(out)
+
+def _decode_rle(payload, size):
+    data = bytearray(size)
+    pos = 0
+    for value, length in RLE_RUN.iter_unpack(payload):
+        if pos + length > size:
+            raise ValueError("run-length data is longer than the grid")
+        data[pos:pos + length] = bytes((value,)) * length
+        pos += length
+    if pos != size:
+        raise ValueError("run-length data is shorter than the grid")
+    return data
+
+# --- Demo: python grid_store.py [path rows cols] ---
+if __name__ == "__main__":
+    from simple_grid import print_grid
+
+    path, rows, cols = "demo.grid", 10_000, 10_000
+    if len(sys.argv) == 4:
+        path, rows, cols = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+
+    start = time.perf_counter()
+    with CharGrid.create(path, rows, cols) as grid:
+        for r in range(0, rows, 7):
+            grid.set(r, (r * 13) % cols, "#")
+    print(f"Created {rows * cols:,} cells in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    with CharGrid.open(path) as grid:
+        opened = time.perf_counter()
+        print_grid(grid, top=rows // 2, left=cols // 2, height=40, width=120)
+        shown = time.perf_counter()
+    print(f"Opened in {(opened - start) * 1000:.2f} ms, printed 40x120 window in {(shown - opened) * 1000:.2f} ms")
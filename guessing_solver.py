@@ -0,0 +1,196 @@
+# Strategies, a bulk evaluator and exact optimal attempt counts for the
+# number guessing game ("higher" / "lower" feedback on any integer range).
+#
+# Strategies are callables (low, high, rng) -> guess over the interval of
+# secrets still possible, so they plug into number_gussing_game.play. Each
+# one also has a vector() form that guesses for NumPy arrays of intervals,
+# which bulk_evaluate uses to play millions of secrets at once.
+
+import random
+import sys
+import time
+from collections import Counter
+from fractions import Fraction
+
+from number_gussing_game import play
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+# Largest range bulk_evaluate plays exhaustively instead of sampling
+MAX_EXHAUSTIVE = 10_000_000
+
+class BinarySearch:
+    """Always guess the middle of the interval (lower middle on ties)"""
+
+    name = "binary"
+
+    def __call__(self, low, high, rng=None):
+        return low + (high - low) // 2
+
+    def vector(self, low, high, rng):
+        # (high - low) can exceed int64 on 64-bit ranges; in uint64 it wraps correctly
+        half = (high.view(np.uint64) - low.view(np.uint64)) >> np.uint64(1)
+        return (low.view(np.uint64) + half).view(np.int64)
+
+class RandomGuess:
+    """Guess uniformly at random inside the interval"""
+
+    name = "random"
+
+    def __call__(self, low, high, rng=random):
+        return rng.randint(low, high)
+
+    def vector(self, low, high, rng):
+        return rng.integers(low, high, endpoint=True)
+
+class PriorOptimal:
+    """Minimum expected attempts for secrets drawn with the given weights
+
+    weights[i] is the (relative) chance that the secret is low + i. The
+    guess for every interval is the root of an optimal binary search tree,
+    found with Knuth's O(n^2) dynamic program.
+    """
+
+    name = "prior"
+
+    def __init__(self, weights, low=1):
+        n = len(weights)
+        if n == 0:
+            raise ValueError("weights must not be empty")
+        self.low = low
+        self.high = low + n - 1
+        self.total_weight = sum(weights)
+
+        prefix = [0]
+        for weight in weights:
+            prefix.append(prefix[-1] + weight)
+        # cost[i][j]: weighted attempts for interval i..j-1 (half-open), root[i][j] its guess
+        cost = [[0] * (n + 1) for _ in range(n + 1)]
+        root = [[0] * (n + 1) for _ in range(n + 1)]
+        for i in range(n):
+            cost[i][i + 1] = weights[i]
+            root[i][i + 1] = i
+        for length in range(2, n + 1):
+            for i in range(n - length + 1):
+                j = i + length
+                best, best_root = None, None
+                # Knuth: the optimal root moves right as the interval does
+                for r in range(root[i][j - 1], root[i + 1][j] + 1):
+                    value = cost[i][r] + cost[r + 1][j]
+                    if best is None or value < best:
+                        best, best_root = value, r
+                cost[i][j] = best + prefix[j] - prefix[i]
+                root[i][j] = best_root
+        self.weighted_cost = cost[0][n]
+        self.roots = [[root[i][j + 1] if j >= i else 0 for j in range(n)] for i in range(n)]
+        self._root_array = None
+
+    def expected_attempts(self):
+        """Exact expected attempts under the prior, as a Fraction"""
+        return Fraction(self.weighted_cost, self.total_weight)
+
+    def __call__(self, low, high, rng=None):
+        return self.low + self.roots[low - self.low][high - self.low]
+
+    def vector(self, low, high, rng):
+        if self._root_array is None:
+            self._root_array = np.array(self.roots, dtype=np.int64)
+        return self.low + self._root_array[low - self.low, high - self.low]
+
+STRATEGIES = {"binary": BinarySearch, "random": RandomGuess}
+
+def optimal_worst_case(low, high):
+    """Fewest attempts that always find a secret in [low, high]: ceil(log2(n + 1))"""
+    return (high - low + 1).bit_length()
+
+def optimal_expected(low, high):
+    """Fewest expected attempts for a uniform secret in [low, high], as a Fraction
+
+    The best strategy is a search tree with every level full except the
+    last, and binary search builds exactly that: 2**(d-1) secrets are found
+    on attempt d for each full level d = 1..h, and the rest on attempt h+1.
+    """
+    n = high - low + 1
+    full_levels = (n + 1).bit_length() - 1
+    # sum of d * 2**(d-1) for d = 1..h is (h - 1) * 2**h + 1
+    cost = (full_levels - 1) * (1 << full_levels) + 1
+    cost += (full_levels + 1) * (n - (1 << full_levels) + 1)
+    return Fraction(cost, n)
+
+def bulk_evaluate(strategy, low, high, secrets=None, samples=1_000_000, seed=0, chunk_size=1_000_000):
+    """Attempt-count distribution of a strategy: Counter {attempts: games}
+
+    Plays every secret in [low, high] when there are at most MAX_EXHAUSTIVE
+    of them (exact for deterministic strategies), otherwise samples
+    uniform secrets. Games are played chunk_size at a time as NumPy arrays,
+    one vectorized guess per round for every game still running.
+    """
+    if np is None:
+        raise ImportError("bulk_evaluate() needs NumPy")
+    if not (INT64_MIN <= low <= high <= INT64_MAX):
+        raise ValueError("bulk_evaluate() supports ranges within 64-bit signed integers")
+    rng = np.random.default_rng(seed)
+    if secrets is not None:
+        secrets = np.asarray(secrets, dtype=np.int64)
+        chunks = (secrets[i:i + chunk_size] for i in range(0, len(secrets), chunk_size))
+    elif high - low + 1 <= MAX_EXHAUSTIVE:
+        chunks = (np.arange(start, min(start + chunk_size, high + 1), dtype=np.int64)
+                  for start in range(low, high + 1, chunk_size))
+    else:
+        chunks = (rng.integers(low, high, size=min(chunk_size, samples - done), endpoint=True, dtype=np.int64)
+                  for done in range(0, samples, chunk_size))
+
+    distribution = Counter()
+    for secret in chunks:
+        lo = np.full(len(secret), low, dtype=np.int64)
+        hi = np.full(len(secret), high, dtype=np.int64)
+        attempts = 0
+        while len(secret):
+            attempts += 1
+            guess = strategy.vector(lo, hi, rng)
+            found = guess == secret
+            distribution[attempts] += int(np.count_nonzero(found))
+            # Narrow each interval, then drop the finished games
+            too_low = guess < secret
+            lo = np.where(too_low, guess + 1, lo)
+            hi = np.where(too_low, hi, guess - 1)
+            running = ~found
+            secret, lo, hi = secret[running], lo[running], hi[running]
+    return distribution
+
+def summarize(distribution):
+    games = sum(distribution.values())
+    mean = sum(attempts * count for attempts, count in distribution.items()) / games
+    return games, mean, max(distribution)
+
+# --- Demo: python guessing_solver.py [low high] ---
+if __name__ == "__main__":
+    low, high = 1, 100
+    if len(sys.argv) == 3:
+        low, high = int(sys.argv[1]), int(sys.argv[2])
+
+    for range_low, range_high in ((low, high), (INT64_MIN, INT64_MAX)):
+        print(f"Range [{range_low}, {range_high}]: optimal worst case "
+              f"{optimal_worst_case(range_low, range_high)}, optimal expected "
+              f"{float(optimal_expected(range_low, range_high)):.4f}")
+        for name, strategy_class in STRATEGIES.items():
+            start = time.perf_counter()
+            games, mean, worst = summarize(bulk_evaluate(strategy_class(), range_low, range_high))
+            print(f"  {name:>6}: {games:,} games, mean {mean:.4f}, worst {worst} "
+                  f"({time.perf_counter() - start:.2f}s)")
+
+    # A prior where small numbers are much more likely than large ones
+    weights = [1000 // n for n in range(1, 201)]
+    prior = PriorOptimal(weights, low=1)
+    rng = random.Random(0)
+    secrets = rng.choices(range(1, 201), weights=weights, k=200_000)
+    games, mean, worst = summarize(bulk_evaluate(prior, 1, 200, secrets=secrets))
+    binary_mean = summarize(bulk_evaluate(BinarySearch(), 1, 200, secrets=secrets))[1]
+    print(f"Skewed prior on [1, 200]: optimal expected {float(prior.expected_attempts()):.4f}, "
+          f"simulated {mean:.4f} (binary search {binary_mean:.4f}), worst {worst}")
+    print(f"One game with the prior strategy: {play(prior, 1, 200, secrets[0])} attempts")
@@ -0,0 +1,303 @@
+# Generalized m,n,k-game engine (k in a row on an m x n board), e.g.
+# tic-tac-toe is 3,3,3 and Gomoku-style connect-5 on 7x7 is 7,7,5.
+
+import math
+import random
+import sys
+import time
+
+WIN_SCORE = 1_000_000
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the move's time budget runs out"""
+
+class MNKEngine:
+    """Iterative-deepening alpha-beta player for m x n boards with k in a row
+
+    Boards are lists of lists of "X", "O" and " " like in tic_tok_toe.py.
+    Positions are scored by counting open lines: every k-cell window that
+    only holds one player's stones is worth more the fuller it is. Window
+    counts, the evaluation and the win check are all updated incrementally
+    on each move, so only the windows through the last move are touched.
+    Moves are ordered by the transposition-table move, then killer moves,
+    then the history heuristic. find_best_move searches one ply deeper at
+    a time and returns the best move of the deepest finished iteration
+    when time_budget seconds have passed.
+    """
+
+    def __init__(self, rows, cols, k, time_budget=1.0, max_depth=None, radius=None, seed=0):
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.time_budget = time_budget
+        self.max_depth = max_depth or rows * cols
+        # Only consider moves near existing stones on boards bigger than 3x3
+        self.radius = radius if radius is not None else (2 if rows * cols > 9 else max(rows, cols))
+
+        size = rows * cols
+        self.windows = self._build_windows()
+        self.cell_windows = [[] for _ in range(size)]
+        for w, cells in enumerate(self.windows):
+            for cell in cells:
+                self.cell_windows[cell].append(w)
+        self.neighbors = [self._cells_within(cell, self.radius) for cell in range(size)]
+        # Fuller open lines are worth much more: weight[c] for c stones
+        self.line_weight = [0] + [4 ** c for c in range(1, k + 1)]
+
+        rng = random.Random(seed)
+        self.zobrist = {"X": [rng.getrandbits(64) for _ in range(size)],
+                        "O": [rng.getrandbits(64) for _ in range(size)]}
+        self.zobrist_side = rng.getrandbits(64)
+
+        self.transposition_table = {}
+        self.nodes = 0
+        self.completed_depth = 0
+
+    def _build_windows(self):
+        """Every run of k cells in a row, column or diagonal, as flat indices"""
+        windows = []
+        for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for r in range(self.rows):
+                for c in range(self.cols):
+                    end_r, end_c = r + dr * (self.k - 1), c + dc * (self.k - 1)
+                    if 0 <= end_r < self.rows and 0 <= end_c < self.cols:
+                        windows.append([(r + dr * i) * self.cols + c + dc * i for i in range(self.k)])
+        return windows
+
+    def _cells_within(self, cell, radius):
+        r, c = divmod(cell, self.cols)
+        return [nr * self.cols + nc
+                for nr in range(max(0, r - radius), min(self.rows, r + radius + 1))
+                for nc in range(max(0, c - radius), min(self.cols, c + radius + 1))
+                if (nr, nc) != (r, c)]
+
+    # --- Incremental position state ---
+
+    def _load(self, board):
+        """Set up the incremental state for a list board"""
+        size = self.rows * self.cols
+        self.cells = [" "] * size
+        self.count = {"X": [0] * len(self.windows), "O": [0] * len(self.windows)}
+        self.near = [0] * size
+        self.score = 0  # evaluation from X's point of view
+        self.hash = 0
+        self.filled = 0
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if board[r][c] != " ":
+                    self._make(r * self.cols + c, board[r][c])
+
+    def _window_value(self, w):
+        x, o = self.count["X"][w], self.count["O"][w]
+        if x and o:
+            return 0
+        return self.line_weight[x] - self.line_weight[o]
+
+    def _make(self, cell, player):
+        """Place a stone; True if it completes k in a row"""
+        won = False
+        counts = self.count[player]
+        for w in self.cell_windows[cell]:
+            before = self._window_value(w)
+            counts[w] += 1
+            self.score += self._window_value(w) - before
+            if counts[w] == self.k:
+                won = True
+        for neighbor in self.neighbors[cell]:
+            self.near[neighbor] += 1
+        self.cells[cell] = player
+        self.hash ^= self.zobrist[player][cell]
+        self.filled += 1
+        return won
+
+    def _unmake(self, cell, player):
+        counts = self.count[player]
+        for w in self.cell_windows[cell]:
+            before = self._window_value(w)
+            counts[w] -= 1
+            self.score += self._window_value(w) - before
+        for neighbor in self.neighbors[cell]:
+            self.near[neighbor] -= 1
+        self.cells[cell] = " "
+        self.hash ^= self.zobrist[player][cell]
+        self.filled -= 1
+
+    def _candidates(self):
+        if self.filled == 0:
+            return [(self.rows // 2) * self.cols + self.cols // 2]
+        return [cell for cell, stone in enumerate(self.cells) if stone == " " and self.near[cell]]
+
+    # --- Search ---
+
+    def _ordered_moves(self, ply, tt_move):
+        killers = self.killers[ply]
+        history = self.history
+
+        def priority(cell):
+            if cell == tt_move:
+                return (2, 0)
+            if cell in killers:
+                return (1, 0)
+            return (0, history[cell])
+        return sorted(self._candidates(), key=priority, reverse=True)
+
+    def _negamax(self, depth, ply, alpha, beta, player):
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+        if depth == 0:
+            return self.score if player == "X" else -self.score
+
+        key = self.hash ^ (self.zobrist_side if player == "O" else 0)
+        entry = self.transposition_table.get(key)
+        tt_move = None
+        if entry is not None:
+            entry_depth, value, bound, tt_move = entry
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    return value
+                if bound == LOWER:
+                    alpha = max(alpha, value)
+                elif bound == UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        alpha_start = alpha
+        opponent = "O" if player == "X" else "X"
+        best, best_move = -math.inf, None
+        for cell in self._ordered_moves(ply, tt_move):
+            if self._make(cell, player):
+                value = WIN_SCORE - ply - 1  # faster wins score higher
+            elif self.filled == len(self.cells):
+                value = 0
+            else:
+                try:
+                    value = -self._negamax(depth - 1, ply + 1, -beta, -alpha, opponent)
+                except SearchTimeout:
+                    self._unmake(cell, player)
+                    raise
+            self._unmake(cell, player)
+
+            if value > best:
+                best, best_move = value, cell
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                # Quiet move that refuted this line: remember it
+                if cell not in self.killers[ply]:
+                    self.killers[ply] = [cell] + self.killers[ply][:1]
+                self.history[cell] += depth * depth
+                break
+
+        if best_move is None:
+            return 0  # no candidate moves: board is full
+        if best <= alpha_start:
+            bound = UPPER
+        elif best >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.transposition_table[key] = (depth, best, bound, best_move)
+        return best
+
+    def _search_root(self, depth, player, root_moves):
+        """One full-width iteration; returns (value, move) and reorders root_moves"""
+        opponent = "O" if player == "X" else "X"
+        alpha, beta = -math.inf, math.inf
+        best, best_move = -math.inf, root_moves[0]
+        values = {}
+        for cell in root_moves:
+            if self._make(cell, player):
+                value = WIN_SCORE - 1
+            elif self.filled == len(self.cells):
+                value = 0
+            else:
+                try:
+                    value = -self._negamax(depth - 1, 1, -beta, -alpha, opponent)
+                except SearchTimeout:
+                    self._unmake(cell, player)
+                    raise
+            self._unmake(cell, player)
+            values[cell] = value
+            if value > best:
+                best, best_move = value, cell
+                alpha = max(alpha, value)
+        root_moves.sort(key=lambda cell: values[cell], reverse=True)
+        return best, best_move
+
+    def find_best_move(self, board, player="X"):
+        """Best (row, col) for player within the time budget"""
+        self._load(board)
+        self.deadline = time.perf_counter() + self.time_budget
+        # Win scores are relative to the root, so entries don't carry over
+        self.transposition_table = {}
+        self.nodes = 0
+        self.completed_depth = 0
+        self.killers = [[] for _ in range(len(self.cells) + 1)]
+        self.history = [0] * len(self.cells)
+
+        root_moves = self._candidates()
+        if not root_moves:
+            return None
+        best_move = root_moves[0]
+        if len(root_moves) == 1:
+            return divmod(best_move, self.cols)
+        empty = len(self.cells) - self.filled
+        for depth in range(1, min(self.max_depth, empty) + 1):
+            try:
+                value, best_move = self._search_root(depth, player, root_moves)
+            except SearchTimeout:
+                break
+            self.completed_depth = depth
+            if abs(value) >= WIN_SCORE - len(self.cells):
+                break  # forced win or loss found: deeper search won't change it
+        return divmod(best_move, self.cols)
+
+# Function to check a list board for k in a row
+def check_winner(board, k):
+    rows, cols = len(board), len(board[0])
+    for r in range(rows):
+        for c in range(cols):
+            player = board[r][c]
+            if player == " ":
+                continue
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                if (0 <= end_r < rows and 0 <= end_c < cols
+                        and all(board[r + dr * i][c + dc * i] == player for i in range(k))):
+                    return player
+    return None
+
+# Function to print a board of any size
+def print_board(board):
+    for row in board:
+        print(" ".join(cell if cell != " " else "." for cell in row))
+
+# --- Engine vs engine demo: python mnk_engine.py [rows cols k seconds] ---
+if __name__ == "__main__":
+    rows, cols, k, budget = 7, 7, 5, 0.5
+    if len(sys.argv) == 5:
+        rows, cols, k, budget = int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4])
+
+    board = [[" " for _ in range(cols)] for _ in range(rows)]
+    engines = {"X": MNKEngine(rows, cols, k, time_budget=budget, seed=1),
+               "O": MNKEngine(rows, cols, k, time_budget=budget, seed=2)}
+    player = "X"
+    print(f"{rows}x{cols} board, {k} in a row, {budget}s per move")
+    for _ in range(rows * cols):
+        engine = engines[player]
+        start = time.perf_counter()
+        row, col = engine.find_best_move(board, player)
+        elapsed = time.perf_counter() - start
+        board[row][col] = player
+        print(f"{player} plays ({row}, {col}) - depth {engine.completed_depth}, "
+              f"{engine.nodes} nodes, {elapsed:.2f}s")
+        if check_winner(board, k):
+            break
+        player = "O" if player == "X" else "X"
+
+    print_board(board)
+    winner = check_winner(board, k)
+    print(f"{winner} wins!" if winner else "It's a draw!")
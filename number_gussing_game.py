@@ -2,15 +2,56 @@
 
 import random
 
+TOO_LOW, CORRECT, TOO_HIGH = -1, 0, 1
+
+class GuessingGame:
+  """
+  Headless game state: a secret in [low, high] and the guesses so far.
+  Any integer range works, including the full 64-bit one. Because the
+  only feedback is higher/lower, the secrets still possible always form
+  the interval [self.low, self.high].
+  """
+
+  def __init__(self, low=1, high=100, secret=None, rng=random):
+    if low > high:
+      raise ValueError(f"empty range [{low}, {high}]")
+    self.range_low = low
+    self.range_high = high
+    self.secret = rng.randint(low, high) if secret is None else secret
+    self.low = low
+    self.high = high
+    self.attempts = 0
+    self.solved = False
+
+  def guess(self, number):
+    """Returns TOO_LOW, CORRECT or TOO_HIGH and narrows the interval."""
+    self.attempts += 1
+    if number < self.secret:
+      self.low = max(self.low, number + 1)
+      return TOO_LOW
+    if number > self.secret:
+      self.high = min(self.high, number - 1)
+      return TOO_HIGH
+    self.solved = True
+    return CORRECT
+
+def play(strategy, low, high, secret, rng=random):
+  """
+  Plays one game with a strategy, a function (low, high, rng) -> guess
+  given the interval of secrets still possible. Returns the attempts.
+  """
+  game = GuessingGame(low, high, secret)
+  while not game.solved:
+    game.guess(strategy(game.low, game.high, rng))
+  return game.attempts
+
 def number_guessing_game():
   """
   This function runs a number guessing game.
   The computer picks a number between 1 and 100, and the user tries to guess it.
   """
   # Generate a random secret number between 1 and 100 (inclusive)
-  secret_number = random.randint(1, 100)
-  attempts = 0
-  guess = 0 # Initialize guess to a value that won't match the secret number
+  game = GuessingGame(1, 100)
 
   print("--- Number Guessing Game ---")
   print("I have selected a secret number between 1 and 100.")
@@ -18,24 +59,23 @@ def number_guessing_game():
   print("----------------------------")
 
   # Loop until the player guesses the correct number
-  while guess != secret_number:
+  while not game.solved:
     try:
       # Prompt the player for their guess
       guess_input = input("Enter your guess: ")
-      guess = int(guess_input)
-      attempts += 1 # Increment the attempt counter
+      result = game.guess(int(guess_input))
 
       # Provide feedback to the player
-      if guess < secret_number:
+      if result == TOO_LOW:
         print("Too low! Try again.")
-      elif guess > secret_number:
+      elif result == TOO_HIGH:
         print("Too high! Try again.")
       else:
         # The guess is correct
         print("\n=================================================")
         print(f"🎉 Congratulations! You've guessed the number!")
-        print(f"The secret number was {secret_number}.")
-        print(f"It took you {attempts} attempts to guess correctly.")
+        print(f"The secret number was {game.secret}.")
+        print(f"It took you {game.attempts} attempts to guess correctly.")
         print("=================================================")
 
     except ValueError:
@@ -2,8 +2,53 @@
 # Description: This script allows a user to choose an experiment (die roll or card draw)
 # and define an event to calculate its probability.
 
+import math
 import re # Using regex for cleaner input parsing
 
+from probability_engine import FACE_RANKS, RANKS, STANDARD_DECK, SUITS
+
+# --- Bitmask deck ---
+# Card i of probability_engine.STANDARD_DECK is bit i (i = suit * 13 + rank
+# index), so a set of cards is one int. Events are combined with &, | and ~
+# (masked to FULL_DECK) and counted with popcount.
+FULL_DECK = (1 << len(STANDARD_DECK)) - 1
+SUIT_MASKS = {suit: ((1 << 13) - 1) << (13 * s) for s, suit in enumerate(SUITS)}
+RANK_MASKS = {rank: sum(1 << (13 * s + r) for s in range(4)) for r, rank in enumerate(RANKS)}
+FACE_MASK = sum(RANK_MASKS[rank] for rank in FACE_RANKS)
+
+def card_name(index):
+    """Display name of a card index, e.g. 8 -> "10 of Hearts"."""
+    rank, suit = STANDARD_DECK[index]
+    return f"{rank} of {suit}"
+
+def card_names(mask):
+    """Display names of every card in a mask, in deck order."""
+    names = []
+    while mask:
+        low = mask & -mask
+        names.append(card_name(low.bit_length() - 1))
+        mask ^= low
+    return names
+
+def calculate_mask_probability(event_mask, sample_mask=FULL_DECK):
+    """Like calculate_probability, for card sets stored as bitmasks."""
+    event_count = (event_mask & sample_mask).bit_count()
+    total_count = sample_mask.bit_count()
+    if total_count == 0:
+        return 0.0, 0, 0
+    return event_count / total_count, event_count, total_count
+
+def draw_probability(event_mask, cards_drawn, at_least=1, sample_mask=FULL_DECK):
+    """Probability that a hand of cards_drawn cards holds at least at_least
+    cards of the event (hypergeometric, from the two popcounts)."""
+    hits = (event_mask & sample_mask).bit_count()
+    total = sample_mask.bit_count()
+    if cards_drawn > total:
+        return 0.0
+    favourable = sum(math.comb(hits, k) * math.comb(total - hits, cards_drawn - k)
+                     for k in range(at_least, min(hits, cards_drawn) + 1))
+    return favourable / math.comb(total, cards_drawn)
+
 def calculate_probability(event_outcomes, sample_space):
     """Calculates and returns the probability of an event."""
     event_count = len(event_outcomes)
@@ -57,10 +102,8 @@ def handle_cards_experiment():
     """Handles the logic for the card-drawing experiment."""
     print("\n--- Drawing a Single Card from a Standard 52-Card Deck ---")
     
-    # Create the sample space for a deck of cards
-    ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
-    suits = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
-    sample_space_cards = {f"{rank} of {suit}" for rank in ranks for suit in suits}
+    # The sample space is the whole deck, as a bitmask
+    sample_space_cards = FULL_DECK
     
     # Present user with choices
     print("Choose the type of event you want to calculate the probability for:")
@@ -70,13 +113,13 @@ def handle_cards_experiment():
     
     while True:
         choice = input("Enter your choice (1, 2, or 3): ")
-        user_event_outcomes = set()
+        user_event_outcomes = 0
         event_description = ""
 
         if choice == '1':
             suit_choice = input("Enter the suit (Hearts, Diamonds, Clubs, or Spades): ").strip().title()
-            if suit_choice in suits:
-                user_event_outcomes = {card for card in sample_space_cards if suit_choice in card}
+            if suit_choice in SUIT_MASKS:
+                user_event_outcomes = SUIT_MASKS[suit_choice]
                 event_description = f"drawing any card of the suit '{suit_choice}'"
                 break
             else:
@@ -84,16 +127,15 @@ def handle_cards_experiment():
         
         elif choice == '2':
             rank_choice = input("Enter the rank (e.g., 7, King, Ace): ").strip().title()
-            if rank_choice in ranks:
-                user_event_outcomes = {card for card in sample_space_cards if card.startswith(rank_choice)}
+            if rank_choice in RANK_MASKS:
+                user_event_outcomes = RANK_MASKS[rank_choice]
                 event_description = f"drawing a card with the rank '{rank_choice}'"
                 break
             else:
                 print("Invalid rank. Please check your spelling and try again.")
 
         elif choice == '3':
-            face_cards = {'Jack', 'Queen', 'King'}
-            user_event_outcomes = {card for card in sample_space_cards if card.split()[0] in face_cards}
+            user_event_outcomes = FACE_MASK
             event_description = "drawing any face card (Jack, Queen, or King)"
             break
             
@@ -101,10 +143,10 @@ def handle_cards_experiment():
             print("Invalid choice. Please enter 1, 2, or 3.")
 
     # Calculate and display results for the card experiment
-    prob, event_n, total_n = calculate_probability(user_event_outcomes, sample_space_cards)
+    prob, event_n, total_n = calculate_mask_probability(user_event_outcomes, sample_space_cards)
     print("\n--- Result ---")
     print(f"The event is: {event_description}.")
-    # print(f"Outcomes in this event: {sorted(list(user_event_outcomes))}") # Optional: uncomment to see all cards
+    # print(f"Outcomes in this event: {card_names(user_event_outcomes)}") # Optional: uncomment to see all cards
     print(f"Number of outcomes in this event: {event_n}")
     print(f"Total outcomes in sample space (a full deck): {total_n}")
     print(f"The probability of this event is: {event_n}/{total_n} = {prob:.2%}")
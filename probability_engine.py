@@ -0,0 +1,525 @@
+# Title: Exact Probability Engine
+# Description: Describes experiments as dice rolls and card draws, and
+# computes exact event probabilities by counting instead of enumerating
+# the sample space (e.g. "sum of 30 dice >= 120" or "at least 3 hearts in
+# a 13-card hand"). Events without a practical exact count (e.g. poker
+# hands) can be estimated by vectorized Monte Carlo sampling instead.
+
+import itertools
+import math
+import multiprocessing
+import operator
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from fractions import Fraction
+from statistics import NormalDist
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'Jack', 'Queen', 'King', 'Ace']
+SUITS = ['Hearts', 'Diamonds', 'Clubs', 'Spades']
+FACE_RANKS = {'Jack', 'Queen', 'King'}
+STANDARD_DECK = [(rank, suit) for suit in SUITS for rank in RANKS]
+
+# Largest sample space an outcome predicate may enumerate
+MAX_ENUMERATION = 2_000_000
+
+class Event:
+    """A yes/no question about the values of one or more aggregates
+
+    Built by comparing aggregates (hand.count_of(suit='Hearts') >= 3) and
+    combined with & (and), | (or) and ~ (not). The test works on single
+    values (exact counting) and on NumPy arrays of samples (estimate).
+    """
+
+    def __init__(self, aggregates, test):
+        self.aggregates = tuple(aggregates)
+        self.test = test  # called with a dict {aggregate: value}
+
+    def __and__(self, other):
+        return Event(_merge(self.aggregates, other.aggregates),
+                     lambda values: _both(self.test(values), other.test(values)))
+
+    def __or__(self, other):
+        return Event(_merge(self.aggregates, other.aggregates),
+                     lambda values: _either(self.test(values), other.test(values)))
+
+    def __invert__(self):
+        return Event(self.aggregates, lambda values: _negate(self.test(values)))
+
+def _merge(first, second):
+    return tuple(dict.fromkeys(first + second))
+
+def _is_array(value):
+    return np is not None and isinstance(value, np.ndarray)
+
+def _both(first, second):
+    if _is_array(first) or _is_array(second):
+        return np.logical_and(first, second)
+    return bool(first) and bool(second)
+
+def _either(first, second):
+    if _is_array(first) or _is_array(second):
+        return np.logical_or(first, second)
+    return bool(first) or bool(second)
+
+def _negate(result):
+    return np.logical_not(result) if _is_array(result) else not result
+
+class Aggregate:
+    """A number computed from one experiment component's outcome
+
+    Comparing it with a number gives an Event; where(fn) accepts any test
+    on the value. Aggregates without a combine rule are computed from the
+    whole outcome, which exact counting can only do by enumeration.
+    """
+
+    def __init__(self, component, name, contribution, combine, label, vector=None, group_key=None):
+        self.component = component
+        self.name = name
+        self.contribution = contribution  # value of one die / one card
+        self.combine = combine            # how values of several dice/cards combine
+        self.label = label
+        self.vector = vector              # optional: values for a 2-D array of sampled indices
+        self.group_key = group_key        # for "most cards sharing a key" aggregates: card -> key
+
+    def __repr__(self):
+        return self.label
+
+    def _compare(self, op, value):
+        return Event((self,), lambda values: op(values[self], value))
+
+    def __eq__(self, value):
+        return self._compare(operator.eq, value)
+
+    def __ne__(self, value):
+        return self._compare(operator.ne, value)
+
+    def __lt__(self, value):
+        return self._compare(operator.lt, value)
+
+    def __le__(self, value):
+        return self._compare(operator.le, value)
+
+    def __gt__(self, value):
+        return self._compare(operator.gt, value)
+
+    def __ge__(self, value):
+        return self._compare(operator.ge, value)
+
+    __hash__ = object.__hash__
+
+    def between(self, low, high):
+        return Event((self,), lambda values: _both(low <= values[self], values[self] <= high))
+
+    def where(self, test):
+        """Event for any test on the value (applied per sample when estimating)"""
+        def check(values):
+            value = values[self]
+            if _is_array(value):
+                return np.fromiter((bool(test(item)) for item in value.tolist()), bool, len(value))
+            return test(value)
+        return Event((self,), check)
+
+    def sample(self, indices, items):
+        """Values for a (samples, picks) array of indices into items"""
+        if self.vector is not None:
+            return self.vector(indices)
+        if self.combine is None:
+            return np.fromiter((bool(self.contribution(tuple(items[i] for i in row)))
+                                for row in indices.tolist()), bool, len(indices))
+        table = np.array([self.contribution(item) for item in items])
+        reduce = {operator.add: np.add, max: np.maximum, min: np.minimum}[self.combine]
+        return reduce.reduce(table[indices], axis=1)
+
+class Dice:
+    """count fair dice with the given number of sides, rolled together"""
+
+    def __init__(self, count, sides=6):
+        if count < 0 or sides < 1:
+            raise ValueError(f"Need a dice count >= 0 and at least 1 side, got {count} dice "
+                             f"with {sides} sides")
+        self.count = count
+        self.sides = sides
+
+    def __repr__(self):
+        return f"Dice({self.count}, sides={self.sides})"
+
+    def total(self):
+        return Aggregate(self, "total", lambda face: face, operator.add, f"sum of {self}")
+
+    def count_of(self, *faces):
+        """Number of dice showing one of faces"""
+        wanted = set(faces)
+        return Aggregate(self, "count", lambda face: int(face in wanted), operator.add,
+                         f"dice of {self} showing {sorted(wanted)}")
+
+    def highest(self):
+        return Aggregate(self, "max", lambda face: face, max, f"highest die of {self}")
+
+    def lowest(self):
+        return Aggregate(self, "min", lambda face: face, min, f"lowest die of {self}")
+
+    def outcome(self, predicate):
+        """Event that predicate(faces) is true for the tuple of all faces
+
+        Needs the whole sample space, so it is only allowed when that is
+        at most MAX_ENUMERATION outcomes.
+        """
+        return _outcome_event(self, predicate)
+
+    def total_outcomes(self):
+        return self.sides ** self.count
+
+    def joint_counts(self, aggregates):
+        """Number of rolls for each combination of aggregate values"""
+        if any(aggregate.combine is None for aggregate in aggregates):
+            return self._enumerate(aggregates)
+
+        # Distribution of one die, then n-fold convolution by repeated squaring
+        single = {}
+        for face in range(1, self.sides + 1):
+            key = tuple(aggregate.contribution(face) for aggregate in aggregates)
+            single[key] = single.get(key, 0) + 1
+        combines = [aggregate.combine for aggregate in aggregates]
+
+        result, power, remaining = None, single, self.count
+        while remaining:
+            if remaining & 1:
+                result = power if result is None else _convolve(result, power, combines)
+            remaining >>= 1
+            if remaining:
+                power = _convolve(power, power, combines)
+        return result if result is not None else {tuple(0 for _ in aggregates): 1}
+
+    def sample(self, rng, size):
+        """(size, count) array of face indices (face - 1) for random rolls"""
+        return rng.integers(0, self.sides, size=(size, self.count))
+
+    def items(self):
+        return list(range(1, self.sides + 1))
+
+    def _enumerate(self, aggregates):
+        _check_enumeration(self.total_outcomes(), self)
+        counts = {}
+        for faces in itertools.product(range(1, self.sides + 1), repeat=self.count):
+            key = tuple(_aggregate_outcome(aggregate, faces) for aggregate in aggregates)
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+class Draw:
+    """count cards drawn together (without replacement) from a deck"""
+
+    def __init__(self, count, deck=None):
+        self.deck = list(deck) if deck is not None else STANDARD_DECK
+        if count < 0:
+            raise ValueError(f"Cannot draw {count} cards")
+        if count > len(self.deck):
+            raise ValueError(f"Cannot draw {count} cards from a {len(self.deck)}-card deck")
+        self.count = count
+
+    def __repr__(self):
+        return f"Draw({self.count})"
+
+    def count_of(self, suit=None, rank=None, face=None, where=None):
+        """Number of drawn cards matching every given condition"""
+        def matches(card):
+            card_rank, card_suit = card
+            return ((suit is None or card_suit == suit)
+                    and (rank is None or card_rank == rank)
+                    and (face is None or (card_rank in FACE_RANKS) == face)
+                    and (where is None or where(card)))
+        parts = [f"{name}={value}" for name, value in
+                 (("suit", suit), ("rank", rank), ("face", face), ("where", where)) if value is not None]
+        return Aggregate(self, "count", lambda card: int(matches(card)), operator.add,
+                         f"cards of {self} with {', '.join(parts) or 'any'}")
+
+    def most_of_a_rank(self):
+        """Largest number of drawn cards sharing a rank (4 = four of a kind)"""
+        return self._most_of(lambda card: card[0], "rank")
+
+    def most_of_a_suit(self):
+        """Largest number of drawn cards sharing a suit (5 of 5 = flush)"""
+        return self._most_of(lambda card: card[1], "suit")
+
+    def _most_of(self, key, label):
+        def whole(cards):
+            values = [key(card) for card in cards]
+            return max(values.count(value) for value in values)
+
+        def vector(indices):
+            groups = sorted({key(card) for card in self.deck})
+            group_of = np.array([groups.index(key(card)) for card in self.deck])
+            # One-hot per sample, then the largest group count per row
+            codes = group_of[indices] + len(groups) * np.arange(len(indices))[:, None]
+            counts = np.bincount(codes.ravel(), minlength=len(groups) * len(indices))
+            return counts.reshape(len(indices), len(groups)).max(axis=1)
+        return Aggregate(self, "most", whole, None, f"most cards of one {label} in {self}", vector, key)
+
+    def outcome(self, predicate):
+        """Event that predicate(cards) is true for the tuple of drawn cards"""
+        return _outcome_event(self, predicate)
+
+    def total_outcomes(self):
+        return math.comb(len(self.deck), self.count)
+
+    def joint_counts(self, aggregates):
+        """Number of hands for each combination of aggregate values
+
+        The deck is split into groups of cards that contribute the same to
+        every aggregate. Choosing k cards from a group of size s can be done
+        in C(s, k) ways, so hands are counted group by group (multivariate
+        hypergeometric counting) without listing them. A "most cards of one
+        rank/suit" aggregate is handled the same way, one rank (or suit) at
+        a time, keeping the largest number taken from any of them so far.
+        """
+        most = [aggregate for aggregate in aggregates if aggregate.group_key is not None]
+        if any(aggregate.combine is None and aggregate.group_key is None for aggregate in aggregates):
+            return self._enumerate(aggregates)
+        if len(most) > 1:
+            if self.total_outcomes() <= MAX_ENUMERATION:
+                return self._enumerate(aggregates)
+            raise ValueError(f"{' and '.join(map(repr, most))} together have no exact count for {self} "
+                             f"({self.total_outcomes()} hands); use estimate() instead")
+
+        additive = [aggregate for aggregate in aggregates if aggregate.group_key is None]
+        key_of = most[0].group_key if most else (lambda card: None)
+        # key group (a rank, a suit, or the whole deck) -> {additive contributions: cards}
+        groups = {}
+        for card in self.deck:
+            parts = tuple(aggregate.contribution(card) for aggregate in additive)
+            subgroups = groups.setdefault(key_of(card), {})
+            subgroups[parts] = subgroups.get(parts, 0) + 1
+
+        # ways[(cards drawn, most taken from one key group, additive values)] = hands
+        ways = {(0, 0, tuple(0 for _ in additive)): 1}
+        for subgroups in groups.values():
+            # choices[(cards taken from this group, additive values)] = ways
+            choices = {(0, tuple(0 for _ in additive)): 1}
+            for parts, size in subgroups.items():
+                next_choices = {}
+                for (taken, values), count in choices.items():
+                    for extra in range(min(size, self.count - taken) + 1):
+                        key = (taken + extra, tuple(value + part * extra for value, part in zip(values, parts)))
+                        next_choices[key] = next_choices.get(key, 0) + count * math.comb(size, extra)
+                choices = next_choices
+
+            next_ways = {}
+            for (drawn, largest, values), count in ways.items():
+                for (taken, group_values), group_count in choices.items():
+                    if drawn + taken > self.count:
+                        continue
+                    key = (drawn + taken, max(largest, taken),
+                           tuple(a + b for a, b in zip(values, group_values)))
+                    next_ways[key] = next_ways.get(key, 0) + count * group_count
+            ways = next_ways
+
+        counts = {}
+        for (drawn, largest, values), count in ways.items():
+            if drawn != self.count:
+                continue
+            additive_values = iter(values)
+            key = tuple(largest if aggregate.group_key is not None else next(additive_values)
+                        for aggregate in aggregates)
+            counts[key] = counts.get(key, 0) + count
+        return counts
+
+    def sample(self, rng, size):
+        """(size, count) array of deck indices for random hands"""
+        # The count smallest of one random key per card is a uniform hand
+        keys = rng.random((size, len(self.deck)))
+        return np.argpartition(keys, self.count - 1, axis=1)[:, :self.count]
+
+    def items(self):
+        return self.deck
+
+    def _enumerate(self, aggregates):
+        _check_enumeration(self.total_outcomes(), self)
+        counts = {}
+        for cards in itertools.combinations(self.deck, self.count):
+            key = tuple(_aggregate_outcome(aggregate, cards) for aggregate in aggregates)
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+def _outcome_event(component, predicate):
+    aggregate = Aggregate(component, "outcome", lambda outcome: bool(predicate(outcome)),
+                          None, f"predicate on {component}")
+    return Event((aggregate,), lambda values: values[aggregate] if _is_array(values[aggregate])
+                 else bool(values[aggregate]))
+
+def _convolve(first, second, combines):
+    result = {}
+    for key_a, count_a in first.items():
+        for key_b, count_b in second.items():
+            key = tuple(combine(a, b) for combine, a, b in zip(combines, key_a, key_b))
+            result[key] = result.get(key, 0) + count_a * count_b
+    return result
+
+def _aggregate_outcome(aggregate, outcome):
+    """Value of an aggregate for one fully listed outcome"""
+    if aggregate.combine is None:
+        return aggregate.contribution(outcome)
+    values = [aggregate.contribution(item) for item in outcome]
+    result = values[0]
+    for value in values[1:]:
+        result = aggregate.combine(result, value)
+    return result
+
+def _check_enumeration(size, component):
+    if size > MAX_ENUMERATION:
+        raise ValueError(f"{component} has {size} outcomes, too many to check an outcome predicate "
+                         f"on each; use aggregates (total, count_of, ...) or estimate() instead")
+
+def probability(event):
+    """Exact probability of an event as a Fraction
+
+    Aggregates are grouped by experiment component; each component's joint
+    value distribution is counted on its own (components are independent)
+    and the event is tested on every combination of values.
+    """
+    by_component = {}
+    for aggregate in event.aggregates:
+        by_component.setdefault(aggregate.component, []).append(aggregate)
+
+    distributions = []
+    total = 1
+    for component, aggregates in by_component.items():
+        counts = component.joint_counts(aggregates)
+        distributions.append((aggregates, list(counts.items())))
+        total *= component.total_outcomes()
+
+    favourable = 0
+    for combination in itertools.product(*(items for _, items in distributions)):
+        values = {}
+        count = 1
+        for (aggregates, _), (key, ways) in zip(distributions, combination):
+            values.update(zip(aggregates, key))
+            count *= ways
+        if event.test(values):
+            favourable += count
+    return Fraction(favourable, total)
+
+# --- Monte Carlo estimation ---
+
+@dataclass
+class Estimate:
+    """Monte Carlo estimate of an event probability"""
+    probability: float
+    low: float          # confidence interval (Wilson score)
+    high: float
+    samples: int
+    batches: int
+    seconds: float
+    converged: bool     # False if max_samples ran out before the precision was reached
+
+def count_hits(event, rng, size):
+    """Number of size random outcomes for which the event happens"""
+    by_component = {}
+    for aggregate in event.aggregates:
+        by_component.setdefault(aggregate.component, []).append(aggregate)
+    values = {}
+    for component, aggregates in by_component.items():
+        indices = component.sample(rng, size)
+        items = component.items()
+        for aggregate in aggregates:
+            values[aggregate] = aggregate.sample(indices, items)
+    result = event.test(values)
+    return int(np.count_nonzero(result)) if _is_array(result) else (size if result else 0)
+
+def _wilson_interval(hits, samples, z):
+    p = hits / samples
+    denominator = 1 + z * z / samples
+    centre = (p + z * z / (2 * samples)) / denominator
+    spread = z * math.sqrt(p * (1 - p) / samples + z * z / (4 * samples * samples)) / denominator
+    return max(0.0, centre - spread), min(1.0, centre + spread)
+
+# Event handed to pool workers; set before the pool forks because events
+# hold lambdas and can't be pickled
+_pool_event = None
+
+def _pool_batch(seed_sequence, size):
+    return count_hits(_pool_event, np.random.default_rng(seed_sequence), size)
+
+def estimate(event, precision=0.001, confidence=0.95, batch_size=50_000,
+             max_samples=50_000_000, seed=None, workers=1):
+    """Estimate an event's probability by sampling in NumPy batches
+
+    Stops once the confidence interval's half-width is at most precision.
+    With workers > 1 every round of batches is spread over a process pool;
+    each batch gets its own stream spawned from the seed, so results only
+    depend on seed, batch_size and workers.
+    """
+    global _pool_event
+    if np is None:
+        raise ImportError("estimate() needs NumPy")
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    root = np.random.SeedSequence(seed)
+    hits = samples = batches = 0
+    low, high = 0.0, 1.0
+    start = time.perf_counter()
+
+    executor = None
+    if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+        _pool_event = event
+        executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("fork"))
+    try:
+        while samples < max_samples and (batches == 0 or (high - low) / 2 > precision):
+            sizes = []
+            for _ in range(workers if executor else 1):
+                size = min(batch_size, max_samples - samples - sum(sizes))
+                if size > 0:
+                    sizes.append(size)
+            streams = root.spawn(len(sizes))
+            if executor:
+                round_hits = list(executor.map(_pool_batch, streams, sizes))
+            else:
+                round_hits = [count_hits(event, np.random.default_rng(streams[0]), sizes[0])]
+            hits += sum(round_hits)
+            samples += sum(sizes)
+            batches += len(sizes)
+            low, high = _wilson_interval(hits, samples, z)
+    finally:
+        if executor:
+            executor.shutdown()
+            _pool_event = None
+
+    return Estimate(hits / samples, low, high, samples, batches,
+                    time.perf_counter() - start, (high - low) / 2 <= precision)
+
+# Example usage and demonstration
+if __name__ == "__main__":
+    dice = Dice(30)
+    hand = Draw(13)
+    examples = [
+        ("Sum of 30 dice >= 120", dice.total() >= 120),
+        ("At least 3 hearts in a 13-card hand", hand.count_of(suit='Hearts') >= 3),
+        ("Exactly 2 aces and no face cards in 13 cards",
+         (hand.count_of(rank='Ace') == 2) & (hand.count_of(face=True) == 0)),
+        ("30 dice sum >= 120 or 13 cards hold 5+ spades",
+         (dice.total() >= 120) | (hand.count_of(suit='Spades') >= 5)),
+        ("Highest of 3 dice is 6 (by enumeration)", Dice(3).outcome(lambda faces: max(faces) == 6)),
+        ("Four of a kind in 5 cards", Draw(5).most_of_a_rank() == 4),
+        ("Flush (any five of one suit) in 5 cards", Draw(5).most_of_a_suit() == 5),
+    ]
+    for description, event in examples:
+        start = time.perf_counter()
+        result = probability(event)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{description}: {float(result):.6%} ({elapsed:.1f} ms)")
+
+    if np is not None:
+        poker = Draw(5)
+        print("\nMonte Carlo (5-card poker hands, +/-0.05%):")
+        for description, event in [
+            ("Four of a kind", poker.most_of_a_rank() == 4),
+            ("Flush (any five of one suit)", poker.most_of_a_suit() == 5),
+            ("Three hearts and a pair-or-better", (poker.count_of(suit='Hearts') == 3) & (poker.most_of_a_rank() >= 2)),
+        ]:
+            result = estimate(event, precision=0.0005, seed=1, workers=4)
+            print(f"{description}: {result.probability:.4%} "
+                  f"[{result.low:.4%}, {result.high:.4%}] from {result.samples} samples "
+                  f"in {result.seconds:.2f}s")
@@ -0,0 +1,254 @@
+# Title: Batch Probability Service
+# Description: Reads event queries as JSON lines (from a file or stdin),
+# evaluates them with probability_engine and streams one JSON result line
+# per query. Results are memoized in an LRU cache keyed by the canonical
+# form of the query, which can be saved to disk and reused across runs.
+#
+# Query format:
+#   {"id": "q1",
+#    "components": {"d": {"dice": 30, "sides": 6}, "h": {"draw": 13}},
+#    "event": {"and": [{"of": "d", "aggregate": "total", "op": ">=", "value": 120},
+#                      {"not": {"of": "h", "aggregate": "count", "suit": "Hearts",
+#                               "op": "<", "value": 3}}]},
+#    "method": "exact"}
+# Aggregates: total, highest, lowest, count (dice: "faces"; cards: "suit",
+# "rank", "face"), most_of_a_rank, most_of_a_suit. Ops: == != < <= > >=
+# and "in" (value is a list). "method" is "exact" (default) or "estimate"
+# with optional "precision", "confidence" and "seed".
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+
+import probability_engine as engine
+
+OPERATORS = {
+    "==": lambda aggregate, value: aggregate == value,
+    "!=": lambda aggregate, value: aggregate != value,
+    "<": lambda aggregate, value: aggregate < value,
+    "<=": lambda aggregate, value: aggregate <= value,
+    ">": lambda aggregate, value: aggregate > value,
+    ">=": lambda aggregate, value: aggregate >= value,
+    "in": lambda aggregate, value: aggregate.where(lambda v, allowed=frozenset(value): v in allowed),
+}
+
+class QueryError(ValueError):
+    """Raised for a query that can't be understood"""
+
+class ResultCache:
+    """Bounded LRU cache of results by canonical query, optionally on disk"""
+
+    def __init__(self, max_entries=10000, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+        if path and os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.put(entry["key"], entry["result"])
+
+    def get(self, key):
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self):
+        """Write the cache (oldest first) so loading keeps the LRU order"""
+        if not self.path:
+            return
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            for key, result in self.entries.items():
+                f.write(json.dumps({"key": key, "result": result}) + "\n")
+        os.replace(temp_path, self.path)
+
+def canonical_event(event):
+    """Normalized copy of an event spec: defaults filled, and/or flattened and sorted"""
+    if not isinstance(event, dict):
+        raise QueryError(f"event must be an object, got {event!r}")
+    for combinator in ("and", "or"):
+        if combinator in event:
+            if not isinstance(event[combinator], list):
+                raise QueryError(f"'{combinator}' needs a list of events, got {event[combinator]!r}")
+            operands = []
+            for operand in event[combinator]:
+                operand = canonical_event(operand)
+                # (a and (b and c)) is (a and b and c)
+                operands.extend(operand[combinator] if combinator in operand else [operand])
+            unique = {json.dumps(operand, sort_keys=True): operand for operand in operands}
+            if not unique:
+                raise QueryError(f"'{combinator}' needs at least one operand")
+            if len(unique) == 1:
+                return next(iter(unique.values()))
+            return {combinator: [unique[key] for key in sorted(unique)]}
+    if "not" in event:
+        inner = canonical_event(event["not"])
+        return inner["not"] if "not" in inner else {"not": inner}
+
+    spec = dict(event)
+    for field in ("of", "aggregate", "op", "value"):
+        if field not in spec:
+            raise QueryError(f"event is missing '{field}': {event!r}")
+    if spec["op"] not in OPERATORS:
+        raise QueryError(f"unknown op {spec['op']!r}")
+    if spec["op"] == "in":
+        spec["value"] = sorted(set(spec["value"]))
+    if "faces" in spec:
+        spec["faces"] = sorted(set(spec["faces"]))
+    if "suit" in spec:
+        spec["suit"] = str(spec["suit"]).title()
+    if "rank" in spec:
+        spec["rank"] = str(spec["rank"]).title()
+    return spec
+
+def canonical_query(query):
+    """Canonical form of a query (without its id) and its cache key"""
+    if not isinstance(query, dict):
+        raise QueryError(f"query must be an object, got {query!r}")
+    specs = query.get("components", {})
+    if not isinstance(specs, dict):
+        raise QueryError(f"components must be an object of name -> spec, got {specs!r}")
+    components = {}
+    for name, spec in specs.items():
+        if not isinstance(spec, dict):
+            raise QueryError(f"component {name!r} must be an object, got {spec!r}")
+        if "dice" in spec:
+            components[name] = {"dice": int(spec["dice"]), "sides": int(spec.get("sides", 6))}
+            if components[name]["dice"] < 0 or components[name]["sides"] < 1:
+                raise QueryError(f"component {name!r} needs dice >= 0 and sides >= 1")
+        elif "draw" in spec:
+            components[name] = {"draw": int(spec["draw"])}
+            if not 0 <= components[name]["draw"] <= len(engine.STANDARD_DECK):
+                raise QueryError(f"component {name!r} must draw 0 to {len(engine.STANDARD_DECK)} cards")
+        else:
+            raise QueryError(f"component {name!r} must be dice or draw")
+    canonical = {"components": components, "event": canonical_event(query.get("event"))}
+    method = query.get("method", "exact")
+    if method == "estimate":
+        canonical.update(method=method, precision=float(query.get("precision", 0.001)),
+                         confidence=float(query.get("confidence", 0.95)), seed=query.get("seed"))
+    elif method != "exact":
+        raise QueryError(f"unknown method {method!r}")
+    else:
+        canonical["method"] = method
+    return canonical, json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+
+def build_event(spec, components):
+    """probability_engine Event for a canonical event spec"""
+    for combinator in ("and", "or"):
+        if combinator in spec:
+            events = [build_event(operand, components) for operand in spec[combinator]]
+            result = events[0]
+            for event in events[1:]:
+                result = result & event if combinator == "and" else result | event
+            return result
+    if "not" in spec:
+        return ~build_event(spec["not"], components)
+
+    component = components.get(spec["of"])
+    if component is None:
+        raise QueryError(f"event refers to unknown component {spec['of']!r}")
+    name = spec["aggregate"]
+    if name == "total" and isinstance(component, engine.Dice):
+        aggregate = component.total()
+    elif name == "highest" and isinstance(component, engine.Dice):
+        aggregate = component.highest()
+    elif name == "lowest" and isinstance(component, engine.Dice):
+        aggregate = component.lowest()
+    elif name == "count" and isinstance(component, engine.Dice):
+        aggregate = component.count_of(*spec.get("faces", []))
+    elif name == "count" and isinstance(component, engine.Draw):
+        aggregate = component.count_of(suit=spec.get("suit"), rank=spec.get("rank"), face=spec.get("face"))
+    elif name == "most_of_a_rank" and isinstance(component, engine.Draw):
+        aggregate = component.most_of_a_rank()
+    elif name == "most_of_a_suit" and isinstance(component, engine.Draw):
+        aggregate = component.most_of_a_suit()
+    else:
+        raise QueryError(f"aggregate {name!r} is not available for {component}")
+    return OPERATORS[spec["op"]](aggregate, spec["value"])
+
+def evaluate(canonical):
+    """Result dict for a canonical query"""
+    components = {}
+    for name, spec in canonical["components"].items():
+        components[name] = (engine.Dice(spec["dice"], spec["sides"]) if "dice" in spec
+                            else engine.Draw(spec["draw"]))
+    event = build_event(canonical["event"], components)
+    if canonical["method"] == "exact":
+        result = engine.probability(event)
+        return {"probability": float(result), "fraction": str(result)}
+    result = engine.estimate(event, precision=canonical["precision"],
+                             confidence=canonical["confidence"], seed=canonical["seed"])
+    return {"probability": result.probability, "low": result.low, "high": result.high,
+            "samples": result.samples, "converged": result.converged}
+
+def run_queries(lines, cache):
+    """Yield one result row per JSONL query line"""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        query_id = number
+        try:
+            query = json.loads(line)
+            if isinstance(query, dict):
+                query_id = query.get("id", number)
+            canonical, key = canonical_query(query)
+            # Unseeded estimates differ from run to run, so they aren't memoized
+            cacheable = canonical["method"] == "exact" or canonical["seed"] is not None
+            result = cache.get(key) if cacheable else None
+            cached = result is not None
+            if not cached:
+                result = evaluate(canonical)
+                if cacheable:
+                    cache.put(key, result)
+            yield {"id": query_id, **result, "cached": cached}
+        except (ValueError, KeyError, TypeError) as e:
+            yield {"id": query_id, "error": str(e)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Evaluate probability queries from JSON lines")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL query file, '-' for stdin")
+    parser.add_argument("--output", default="-", help="JSONL result file, '-' for stdout")
+    parser.add_argument("--cache-size", type=int, default=10000, help="max cached results")
+    parser.add_argument("--cache-file", default=None, help="load/save the result cache here")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.cache_size, args.cache_file)
+    source = sys.stdin if args.input == "-" else open(args.input)
+    stream = sys.stdout if args.output == "-" else open(args.output, "w")
+    count = 0
+    start = time.perf_counter()
+    try:
+        for row in run_queries(source, cache):
+            stream.write(json.dumps(row) + "\n")
+            stream.flush()
+            count += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if stream is not sys.stdout:
+            stream.close()
+        cache.save()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"{count} queries in {elapsed:.3f}s ({rate:.0f} queries/sec, "
+          f"{cache.hits} cache hits, {cache.misses} misses)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
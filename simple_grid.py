@@ -1,15 +1,30 @@
 # 1. Python program to print a simple grid using lists.
 
-def print_grid(grid):
+import sys
+
+def print_grid(grid, top=0, left=0, height=None, width=None, stream=None):
   """
   This function prints a grid represented by a list of lists.
   Each inner list represents a row.
+
+  The grid can also be a grid_store.CharGrid; then only the viewport
+  starting at (top, left) is read. The whole output is written with a
+  single call, so printing a small window of a huge grid is instant.
   """
-  print("--- Simple Grid ---")
-  for row in grid:
-    # Join each element in the row with a space for neat printing
-    print(" ".join(row))
-  print("-------------------")
+  stream = stream or sys.stdout
+  if hasattr(grid, "window"):
+    height = grid.rows if height is None else height
+    width = grid.cols if width is None else width
+    rows = [bytes(view).decode() for view in grid.window(top, left, height, width)]
+  else:
+    bottom = len(grid) if height is None else top + height
+    rows = [row[left:None if width is None else left + width] for row in grid[top:bottom]]
+
+  # Join each element in the row with a space for neat printing
+  lines = ["--- Simple Grid ---"]
+  lines.extend(" ".join(row) for row in rows)
+  lines.append("-------------------")
+  stream.write("\n".join(lines) + "\n")
 
 # --- Main part of the program ---
 if __name__ == "__main__":
@@ -1,7 +1,14 @@
+import heapq
 import random
 import time
+from collections import deque
 from enum import Enum
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Set
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; bytearray storage works without it
+    np = None
 
 class CellType(Enum):
     EMPTY = 0
@@ -16,139 +23,433 @@ class Direction(Enum):
     LEFT = (0, -1)
     RIGHT = (0, 1)
 
+# Display character for each cell type
+CELL_SYMBOLS = {
+    CellType.EMPTY: '.',
+    CellType.OBSTACLE: '#',
+    CellType.GOAL: 'G',
+    CellType.AGENT: 'A',
+    CellType.COLLECTED: 'X'
+}
+
+# Direction offsets as plain tuples, in Direction order
+DIRECTION_OFFSETS = tuple(direction.value for direction in Direction)
+
+# Offsets for each 4-bit direction mask (bit d set = DIRECTION_OFFSETS[d])
+OFFSETS_BY_MASK = tuple(
+    tuple(offset for bit, offset in enumerate(DIRECTION_OFFSETS) if mask >> bit & 1)
+    for mask in range(16)
+)
+
+# Byte value -> 1 if the cell is not an obstacle, for ByteGrid contents
+_FREE_BYTES = bytes(0 if value == CellType.OBSTACLE.value else 1 for value in range(256))
+
+# CellType members indexed by their value, for decoding compact grids
+CELL_TYPES = sorted(CellType, key=lambda cell: cell.value)
+
+class ByteGrid:
+    """Row-major grid storing one byte (the CellType value) per cell"""
+
+    def __init__(self, rows: int, cols: int, backend: str = "bytearray"):
+        self.rows = rows
+        self.cols = cols
+        self.backend = backend
+        if backend == "bytearray":
+            self.cells = bytearray(rows * cols)
+        elif backend == "numpy":
+            if np is None:
+                raise ImportError("numpy grid storage requires NumPy to be installed")
+            self.cells = np.zeros(rows * cols, dtype=np.uint8)
+        else:
+            raise ValueError(f"Unknown grid backend: {backend!r}")
+
+    def get(self, row: int, col: int) -> CellType:
+        return CELL_TYPES[self.cells[row * self.cols + col]]
+
+    def set(self, row: int, col: int, cell: CellType):
+        self.cells[row * self.cols + col] = cell.value
+
+    def fill(self, indices: List[int], cell: CellType):
+        """Set many flat cell indices to the same cell type at once"""
+        if self.backend == "numpy":
+            self.cells[np.asarray(indices, dtype=np.int64)] = cell.value
+        else:
+            for index in indices:
+                self.cells[index] = cell.value
+
+    def row(self, row: int) -> List[CellType]:
+        start = row * self.cols
+        return [CELL_TYPES[value] for value in self.cells[start:start + self.cols]]
+
+    def count(self, cell: CellType) -> int:
+        if self.backend == "numpy":
+            return int(np.count_nonzero(self.cells == cell.value))
+        return self.cells.count(cell.value)
+
+class Perception:
+    """What the agent senses around itself on one step
+    
+    One record is reused for the whole simulation. moves holds the offsets
+    of the in-bounds, obstacle-free neighbors (a shared tuple, not rebuilt
+    per step). Item access (perception['goals_visible']) and the neighbors
+    dict are kept for code written against the earlier dict-based perception.
+    """
+    __slots__ = ('position', 'current_cell', 'moves', 'goals_visible', 'obstacles_nearby', '_agent')
+    
+    def __init__(self, agent=None):
+        self._agent = agent
+        self.position = (0, 0)
+        self.current_cell = CellType.EMPTY
+        self.moves = ()
+        self.goals_visible = []
+        self.obstacles_nearby = False
+    
+    @property
+    def neighbors(self) -> dict:
+        """Cell type of every in-bounds neighbor, by position (built on request)"""
+        return {pos: self._agent._get_cell(pos) for pos in self._agent._neighbors_of(self.position)}
+    
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
 class ReflexAgent:
-    def __init__(self, grid_size: Tuple[int, int], obstacle_density: float = 0.2):
+    def __init__(self, grid_size: Tuple[int, int], obstacle_density: float = 0.2,
+                 storage: str = "list", seed: Optional[int] = None, quiet: bool = False,
+                 connected: bool = False, world=None):
         self.rows, self.cols = grid_size
         self.position = (0, 0)  # Starting position
         self.goals_collected = 0
         self.steps_taken = 0
         self.max_steps = 1000
+        self.quiet = quiet  # Suppress progress messages (e.g. for batch runs)
+        
+        # A seeded agent owns its RNG so runs are reproducible in any process;
+        # otherwise it shares the global random state
+        self.rng = random.Random(seed) if seed is not None else random
+        
+        # Live index of uncollected goals, kept in sync by _execute_action
+        self.goal_positions: Set[Tuple[int, int]] = set()
+        self.remaining_goals = 0
+        
+        # Positions written since a renderer last drew the grid (None
+        # unless a renderer is tracking changes)
+        self.changed_cells: Optional[Set[Tuple[int, int]]] = None
         
-        # Initialize grid
-        self.grid = [[CellType.EMPTY for _ in range(self.cols)] for _ in range(self.rows)]
-        self._generate_environment(obstacle_density)
+        # Per-cell direction bits (see _direction_bits), built once the
+        # grid exists, and the perception record reused every step
+        self._direction_table: Optional[bytearray] = None
+        self._perception = Perception(self)
+        
+        # Initialize grid: "list" keeps a list of lists of CellType,
+        # "bytearray"/"numpy" keep one byte per cell in a ByteGrid.
+        # A prebuilt world (e.g. chunked_world.ChunkedWorld) generates its
+        # own cells on demand; its goals are open-ended, so the run only
+        # stops at max_steps.
+        if world is not None:
+            self.storage = "world"
+            self.grid = world
+            self.rows, self.cols = world.rows, world.cols
+            self.remaining_goals = float("inf")
+        else:
+            self.storage = storage
+            if storage == "list":
+                self.grid = [[CellType.EMPTY for _ in range(self.cols)] for _ in range(self.rows)]
+            else:
+                self.grid = ByteGrid(self.rows, self.cols, backend=storage)
+            self._generate_environment(obstacle_density, connected=connected)
+            self._direction_table = self._build_direction_table()
         
         # Place agent at starting position
-        self.grid[self.position[0]][self.position[1]] = CellType.AGENT
+        self._set_cell(self.position, CellType.AGENT)
+    
+    def _get_cell(self, pos: Tuple[int, int]) -> CellType:
+        """Return the cell type at a position, whatever the grid storage"""
+        if self.storage == "list":
+            return self.grid[pos[0]][pos[1]]
+        return self.grid.get(pos[0], pos[1])
+    
+    def _set_cell(self, pos: Tuple[int, int], cell: CellType):
+        """Set the cell type at a position, whatever the grid storage"""
+        if self.storage == "list":
+            self.grid[pos[0]][pos[1]] = cell
+        else:
+            self.grid.set(pos[0], pos[1], cell)
+        if self.changed_cells is not None:
+            self.changed_cells.add(pos)
+    
+    def _grid_rows(self):
+        """Yield each grid row as a list of CellType"""
+        for row in range(self.rows):
+            if self.storage == "list":
+                yield self.grid[row]
+            else:
+                yield self.grid.row(row)
     
-    def _generate_environment(self, obstacle_density: float):
-        """Generate random obstacles and goals in the environment"""
+    def _collect_goal(self, pos: Tuple[int, int]):
+        """Mark the goal at pos as collected and update the goal index"""
+        self._set_cell(pos, CellType.COLLECTED)
+        self.goal_positions.discard(pos)
+        self.remaining_goals -= 1
+        self.goals_collected += 1
+        self._log(f"Goal collected! Total goals: {self.goals_collected}")
+    
+    def _log(self, message: str):
+        """Print a progress message unless the agent is quiet"""
+        if not self.quiet:
+            print(message)
+    
+    def _generate_environment(self, obstacle_density: float, connected: bool = False):
+        """Generate random obstacles and goals in the environment
+        
+        Cells are drawn without replacement from the flat indices of every
+        cell except the start, so generation is linear in the grid size no
+        matter how dense it is. With connected=True, obstacles are moved so
+        that every goal is reachable from the start.
+        """
         total_cells = self.rows * self.cols
         num_obstacles = int(total_cells * obstacle_density)
         num_goals = max(3, int(total_cells * 0.05))  # 5% goals, minimum 3
+        if num_obstacles + num_goals > total_cells - 1:
+            raise ValueError("Grid is too small for the requested obstacles and goals")
         
-        # Place obstacles randomly (avoid starting position)
-        obstacles_placed = 0
-        while obstacles_placed < num_obstacles:
-            row = random.randint(0, self.rows - 1)
-            col = random.randint(0, self.cols - 1)
-            if (row, col) != self.position and self.grid[row][col] == CellType.EMPTY:
-                self.grid[row][col] = CellType.OBSTACLE
-                obstacles_placed += 1
-        
-        # Place goals randomly (avoid starting position and obstacles)
-        goals_placed = 0
-        while goals_placed < num_goals:
-            row = random.randint(0, self.rows - 1)
-            col = random.randint(0, self.cols - 1)
-            if (row, col) != self.position and self.grid[row][col] == CellType.EMPTY:
-                self.grid[row][col] = CellType.GOAL
-                goals_placed += 1
+        # Sample obstacle and goal cells in one draw (avoid starting position)
+        start = self.position[0] * self.cols + self.position[1]
+        picked = self.rng.sample(range(total_cells - 1), num_obstacles + num_goals)
+        picked = [index + 1 if index >= start else index for index in picked]
+        obstacles, goals = picked[:num_obstacles], picked[num_obstacles:]
+        
+        if connected:
+            obstacles = self._connect_goals(start, obstacles, goals)
+        
+        self._fill_cells(obstacles, CellType.OBSTACLE)
+        self._fill_cells(goals, CellType.GOAL)
+        self.goal_positions = {divmod(index, self.cols) for index in goals}
+        self.remaining_goals = len(self.goal_positions)
     
-    def _get_neighbors(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
-        """Get valid neighboring positions"""
-        row, col = pos
+    def _fill_cells(self, indices: List[int], cell: CellType):
+        """Set every flat cell index in indices to the given cell type"""
+        if self.storage == "list":
+            for index in indices:
+                row, col = divmod(index, self.cols)
+                self.grid[row][col] = cell
+        else:
+            self.grid.fill(indices, cell)
+    
+    def _flat_neighbors(self, index: int) -> List[int]:
+        """Flat indices of the in-bounds neighbors of a flat cell index"""
+        row, col = divmod(index, self.cols)
         neighbors = []
-        
-        for direction in Direction:
-            dr, dc = direction.value
+        for dr, dc in DIRECTION_OFFSETS:
             new_row, new_col = row + dr, col + dc
-            
-            # Check if position is within bounds
             if 0 <= new_row < self.rows and 0 <= new_col < self.cols:
-                neighbors.append((new_row, new_col))
-        
+                neighbors.append(new_row * self.cols + new_col)
         return neighbors
     
-    def _perceive_environment(self) -> dict:
-        """Perceive the current environment around the agent"""
-        perception = {
-            'current_cell': self.grid[self.position[0]][self.position[1]],
-            'neighbors': {},
-            'goals_visible': [],
-            'obstacles_nearby': False
-        }
+    def _reachable_from(self, start: int, blocked: bytearray) -> bytearray:
+        """Flood fill from start, returning a 0/1 flag per flat cell index"""
+        reachable = bytearray(len(blocked))
+        reachable[start] = 1
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for index in frontier:
+                for neighbor in self._flat_neighbors(index):
+                    if not reachable[neighbor] and not blocked[neighbor]:
+                        reachable[neighbor] = 1
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return reachable
+    
+    def _connect_goals(self, start: int, obstacles: List[int], goals: List[int]) -> List[int]:
+        """Clear obstacles so every goal is reachable from start
         
-        # Check immediate neighbors
-        for neighbor_pos in self._get_neighbors(self.position):
-            row, col = neighbor_pos
-            cell_type = self.grid[row][col]
-            perception['neighbors'][neighbor_pos] = cell_type
-            
-            if cell_type == CellType.OBSTACLE:
-                perception['obstacles_nearby'] = True
-            elif cell_type == CellType.GOAL:
-                perception['goals_visible'].append(neighbor_pos)
+        A 0-1 BFS from the reachable region (crossing an obstacle costs 1)
+        finds, for each unreachable goal, a path that removes the fewest
+        obstacles. The removed obstacles are re-placed on cells that are
+        still unreachable, which cannot cut any path, so the obstacle count
+        is kept whenever such cells exist. Returns the new obstacle list.
+        """
+        total_cells = self.rows * self.cols
+        blocked = bytearray(total_cells)
+        for index in obstacles:
+            blocked[index] = 1
+        reachable = self._reachable_from(start, blocked)
+        unreachable_goals = [index for index in goals if not reachable[index]]
+        if not unreachable_goals:
+            return obstacles
+        
+        parent = [-1] * total_cells
+        cost = [total_cells] * total_cells
+        queue = deque()
+        for index in range(total_cells):
+            if reachable[index]:
+                cost[index] = 0
+                queue.append(index)
+        while queue:
+            index = queue.popleft()
+            for neighbor in self._flat_neighbors(index):
+                new_cost = cost[index] + blocked[neighbor]
+                if new_cost < cost[neighbor]:
+                    cost[neighbor] = new_cost
+                    parent[neighbor] = index
+                    if blocked[neighbor]:
+                        queue.append(neighbor)
+                    else:
+                        queue.appendleft(neighbor)
+        
+        # Carve a path back to the reachable region for each cut-off goal
+        cleared = 0
+        for index in unreachable_goals:
+            while not reachable[index]:
+                if blocked[index]:
+                    blocked[index] = 0
+                    cleared += 1
+                reachable[index] = 1
+                index = parent[index]
+        
+        # Put the cleared obstacles back somewhere that stays unreachable
+        reachable = self._reachable_from(start, blocked)
+        goal_cells = set(goals)
+        spare = [index for index in range(total_cells)
+                 if not reachable[index] and not blocked[index] and index not in goal_cells]
+        for index in self.rng.sample(spare, min(cleared, len(spare))):
+            blocked[index] = 1
+        return [index for index in range(total_cells) if blocked[index]]
+    
+    def _build_direction_table(self) -> bytearray:
+        """Direction bits of every cell, one byte per flat cell index
+        
+        Obstacles never move, so the table is built once per grid. Each
+        direction's flags are the grid's 0/1 bytes shifted by one row or
+        column; read as one big integer, shifting by d bits puts them in
+        bit d of each byte without touching the neighbouring bytes.
+        """
+        rows, cols = self.rows, self.cols
+        size = rows * cols
+        if self.storage == "list":
+            values = bytes(cell.value for row in self.grid for cell in row)
+        else:
+            values = bytes(self.grid.cells)
+        free = values.translate(_FREE_BYTES)
+        inside = b"\x01" * size
+        
+        def shifted(flags: bytes) -> List[bytearray]:
+            """flags of the neighbor in each direction (0 where out of bounds)"""
+            up = bytearray(bytes(cols) + flags[:size - cols])
+            down = bytearray(flags[cols:] + bytes(cols))
+            left = bytearray(b"\x00" + flags[:size - 1])
+            left[::cols] = bytes(rows)
+            right = bytearray(flags[1:] + b"\x00")
+            right[cols - 1::cols] = bytes(rows)
+            return [up, down, left, right]
+        
+        bits = 0
+        for bit, flags in enumerate(shifted(inside) + shifted(free)):
+            bits |= int.from_bytes(flags, "big") << bit
+        return bytearray(bits.to_bytes(size, "big"))
+    
+    def _direction_bits(self, pos: Tuple[int, int]) -> int:
+        """Bit d set if a move in DIRECTION_OFFSETS[d] stays on the grid,
+        bit d + 4 if that neighbor is also not an obstacle"""
+        row, col = pos
+        if self._direction_table is not None:
+            return self._direction_table[row * self.cols + col]
+        # Worlds too large for a table (chunked_world) are checked per step
+        bits = 0
+        for bit, (dr, dc) in enumerate(DIRECTION_OFFSETS):
+            new_row, new_col = row + dr, col + dc
+            if 0 <= new_row < self.rows and 0 <= new_col < self.cols:
+                bits |= 1 << bit
+                if self._get_cell((new_row, new_col)) != CellType.OBSTACLE:
+                    bits |= 16 << bit
+        return bits
+    
+    def _get_neighbors(self, pos: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Get valid neighboring positions"""
+        return list(self._neighbors_of(pos))
+    
+    def _neighbors_of(self, pos: Tuple[int, int]) -> Tuple[Tuple[int, int], ...]:
+        """In-bounds neighboring positions, in Direction order"""
+        row, col = pos
+        return tuple((row + dr, col + dc) for dr, dc in OFFSETS_BY_MASK[self._direction_bits(pos) & 15])
+    
+    def _perceive_environment(self) -> Perception:
+        """Perceive the current environment around the agent
+        
+        Fills and returns the agent's reusable Perception record.
+        """
+        perception = self._perception
+        position = self.position
+        bits = self._direction_bits(position)
+        perception.position = position
+        perception.current_cell = self._get_cell(position)
+        perception.moves = moves = OFFSETS_BY_MASK[bits >> 4]
+        perception.obstacles_nearby = bits >> 4 != bits & 15
+        
+        # Goals can only be on obstacle-free neighbors
+        goals_visible = perception.goals_visible
+        goals_visible.clear()
+        row, col = position
+        for dr, dc in moves:
+            neighbor_pos = (row + dr, col + dc)
+            if self._get_cell(neighbor_pos) == CellType.GOAL:
+                goals_visible.append(neighbor_pos)
         
         return perception
     
-    def _decide_action(self, perception: dict) -> Optional[Tuple[int, int]]:
+    def _decide_action(self, perception: Perception) -> Optional[Tuple[int, int]]:
         """Simple reflex agent decision making"""
         current_pos = self.position
         
         # Rule 1: If there's a goal adjacent, move to it
-        if perception['goals_visible']:
-            return perception['goals_visible'][0]  # Move to first visible goal
+        if perception.goals_visible:
+            return perception.goals_visible[0]  # Move to first visible goal
         
         # Rule 2: If current cell is a goal, collect it (stay in place)
-        if perception['current_cell'] == CellType.GOAL:
+        if perception.current_cell == CellType.GOAL:
             return current_pos
         
         # Rule 3: Move to a safe adjacent cell (avoid obstacles)
-        safe_moves = []
-        for neighbor_pos, cell_type in perception['neighbors'].items():
-            if cell_type != CellType.OBSTACLE:
-                safe_moves.append(neighbor_pos)
-        
         # Rule 4: If no safe moves, stay in place
-        if not safe_moves:
+        if not perception.moves:
             return current_pos
         
         # Rule 5: Prefer moves that don't go backwards or to visited cells
         # For simplicity, we'll just choose randomly from safe moves
-        return random.choice(safe_moves)
+        dr, dc = self.rng.choice(perception.moves)
+        return (current_pos[0] + dr, current_pos[1] + dc)
     
     def _execute_action(self, new_position: Tuple[int, int]) -> bool:
         """Execute the chosen action"""
         old_pos = self.position
         
         # Check if it's a valid move
-        if new_position not in self._get_neighbors(old_pos) and new_position != old_pos:
-            return False
+        if new_position != old_pos:
+            offset = (new_position[0] - old_pos[0], new_position[1] - old_pos[1])
+            if offset not in DIRECTION_OFFSETS:
+                return False
+            if not self._direction_bits(old_pos) >> DIRECTION_OFFSETS.index(offset) & 1:
+                return False  # Off the grid
         
         # Check if moving to an obstacle
         if (new_position != old_pos and 
-            self.grid[new_position[0]][new_position[1]] == CellType.OBSTACLE):
+            self._get_cell(new_position) == CellType.OBSTACLE):
             return False
         
         # Perform the action
         if new_position == old_pos:
             # Staying in place - check if collecting a goal
-            if self.grid[old_pos[0]][old_pos[1]] == CellType.GOAL:
-                self.grid[old_pos[0]][old_pos[1]] = CellType.COLLECTED
-                self.goals_collected += 1
-                print(f"Goal collected! Total goals: {self.goals_collected}")
+            if self._get_cell(old_pos) == CellType.GOAL:
+                self._collect_goal(old_pos)
         else:
             # Moving to new position
-            if self.grid[new_position[0]][new_position[1]] == CellType.GOAL:
-                self.goals_collected += 1
-                print(f"Goal collected! Total goals: {self.goals_collected}")
-                self.grid[new_position[0]][new_position[1]] = CellType.COLLECTED
+            if self._get_cell(new_position) == CellType.GOAL:
+                self._collect_goal(new_position)
             
             # Update grid
-            if self.grid[old_pos[0]][old_pos[1]] == CellType.AGENT:
-                self.grid[old_pos[0]][old_pos[1]] = CellType.EMPTY
-            self.grid[new_position[0]][new_position[1]] = CellType.AGENT
+            if self._get_cell(old_pos) == CellType.AGENT:
+                self._set_cell(old_pos, CellType.EMPTY)
+            self._set_cell(new_position, CellType.AGENT)
             self.position = new_position
         
         self.steps_taken += 1
@@ -156,66 +457,229 @@ class ReflexAgent:
     
     def print_grid(self):
         """Print the current state of the grid"""
-        symbols = {
-            CellType.EMPTY: '.',
-            CellType.OBSTACLE: '#',
-            CellType.GOAL: 'G',
-            CellType.AGENT: 'A',
-            CellType.COLLECTED: 'X'
-        }
+        symbols = CELL_SYMBOLS
         
         print(f"\nStep {self.steps_taken} - Goals collected: {self.goals_collected}")
         print("+" + "-" * (self.cols * 2 - 1) + "+")
         
-        for row in self.grid:
+        for row in self._grid_rows():
             print("|" + " ".join(symbols[cell] for cell in row) + "|")
         
         print("+" + "-" * (self.cols * 2 - 1) + "+")
         print("Legend: A=Agent, G=Goal, #=Obstacle, X=Collected, .=Empty")
     
-    def run_simulation(self, max_steps: Optional[int] = None, delay: float = 0.5, verbose: bool = True):
-        """Run the agent simulation"""
+    def run_simulation(self, max_steps: Optional[int] = None, delay: float = 0.5, verbose: bool = True,
+                       renderer=None, recorder=None, profiler=None):
+        """Run the agent simulation
+        
+        With a renderer (e.g. grid_renderer.TerminalRenderer) the grid is
+        drawn by it at its own frame rate instead of print_grid + delay,
+        and per-goal messages are held back so they don't break the display.
+        A recorder (e.g. episode_trace.TraceRecorder) gets every step and is
+        closed when the run ends. A profiler (e.g.
+        agent_profiler.SimulationProfiler) times the phases of sampled steps
+        and counts stays, revisits and invalid moves. A move that fails
+        (off the grid or into an obstacle) costs the turn: the agent stays
+        where it is and the run goes on.
+        """
         if max_steps:
             self.max_steps = max_steps
         
-        print(f"Starting simulation with {self.rows}x{self.cols} grid")
-        print(f"Agent starting at position {self.position}")
+        self._log(f"Starting simulation with {self.rows}x{self.cols} grid")
+        self._log(f"Agent starting at position {self.position}")
+        
+        if recorder is not None:
+            recorder.start(self)
+        if profiler is not None:
+            profiler.begin(self)
         
-        if verbose:
+        quiet = self.quiet
+        if renderer is not None:
+            self.quiet = True
+            renderer.render(self, force=True)
+        elif verbose:
             self.print_grid()
         
         while self.steps_taken < self.max_steps:
+            timed = profiler is not None and profiler.start_step()
+            
             # Perceive environment
             perception = self._perceive_environment()
+            if timed:
+                profiler.lap('perceive')
             
             # Decide on action
             action = self._decide_action(perception)
+            if timed:
+                profiler.lap('decide')
             
             if action is None:
-                print("No valid action available!")
+                self._log("No valid action available!")
                 break
             
             # Execute action
+            old_position, goals_before = self.position, self.goals_collected
             success = self._execute_action(action)
+            if timed:
+                profiler.lap('execute')
+            if profiler is not None:
+                profiler.count_step(self, old_position, action, success)
             
             if not success:
-                print("Action execution failed!")
-                break
+                self._log("Action execution failed!")
+                self.steps_taken += 1
+            
+            if recorder is not None:
+                recorder.record(self, old_position, self.goals_collected > goals_before)
             
-            if verbose:
+            if renderer is not None:
+                renderer.render(self)
+            elif verbose:
                 self.print_grid()
                 time.sleep(delay)
+            if timed:
+                profiler.lap('render')
             
-            # Check if all goals are collected
-            remaining_goals = sum(row.count(CellType.GOAL) for row in self.grid)
-            if remaining_goals == 0:
-                print(f"\nAll goals collected in {self.steps_taken} steps!")
+            # Check if all goals are collected (O(1) via the live goal index)
+            done = self.remaining_goals == 0
+            if timed:
+                profiler.lap('goal_check')
+                profiler.end_step(self)
+            if done:
                 break
         
-        print(f"\nSimulation ended:")
-        print(f"Steps taken: {self.steps_taken}")
-        print(f"Goals collected: {self.goals_collected}")
-        print(f"Final position: {self.position}")
+        if renderer is not None:
+            renderer.render(self, force=True)
+            renderer.close()
+            self.changed_cells = None
+            self.quiet = quiet
+        if recorder is not None:
+            recorder.close()
+        if profiler is not None:
+            profiler.end(self)
+        if self.remaining_goals == 0:
+            self._log(f"\nAll goals collected in {self.steps_taken} steps!")
+        
+        self._log(f"\nSimulation ended:")
+        self._log(f"Steps taken: {self.steps_taken}")
+        self._log(f"Goals collected: {self.goals_collected}")
+        self._log(f"Final position: {self.position}")
+
+class PlanningAgent(ReflexAgent):
+    """Agent that follows a BFS distance field towards the nearest goal
+    
+    distance[i] is the number of moves from flat cell i to the closest
+    remaining goal (unreachable cells and obstacles hold self.unreachable).
+    The field is built once with a multi-source BFS and repaired locally
+    whenever a goal is collected. When no goal is reachable the agent falls
+    back to the reflex rules.
+    """
+    
+    def __init__(self, grid_size: Tuple[int, int], obstacle_density: float = 0.2, **kwargs):
+        super().__init__(grid_size, obstacle_density, **kwargs)
+        self.unreachable = self.rows * self.cols
+        self.distance = self._build_distance_field()
+    
+    def _is_open(self, index: int) -> bool:
+        return self._get_cell(divmod(index, self.cols)) != CellType.OBSTACLE
+    
+    def _build_distance_field(self) -> List[int]:
+        """Multi-source BFS from every remaining goal"""
+        distance = [self.unreachable] * (self.rows * self.cols)
+        frontier = [row * self.cols + col for row, col in self.goal_positions]
+        for index in frontier:
+            distance[index] = 0
+        while frontier:
+            next_frontier = []
+            for index in frontier:
+                for neighbor in self._flat_neighbors(index):
+                    if distance[neighbor] == self.unreachable and self._is_open(neighbor):
+                        distance[neighbor] = distance[index] + 1
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return distance
+    
+    def _remove_goal_from_field(self, goal: int):
+        """Repair the distance field after the goal at flat index goal is gone
+        
+        Only cells whose every shortest path led to this goal change. They
+        are found level by level from the goal, reset, and then refilled
+        from the unaffected cells around them.
+        """
+        distance = self.distance
+        affected = {goal}
+        level = [goal]
+        while level:
+            candidates = set()
+            for index in level:
+                for neighbor in self._flat_neighbors(index):
+                    if distance[neighbor] == distance[index] + 1 and neighbor not in affected:
+                        candidates.add(neighbor)
+            level = []
+            for index in candidates:
+                # Still supported if some unaffected neighbor is one step closer
+                if not any(distance[neighbor] == distance[index] - 1 and neighbor not in affected
+                           for neighbor in self._flat_neighbors(index)):
+                    affected.add(index)
+                    level.append(index)
+        
+        heap = []
+        for index in affected:
+            best = self.unreachable
+            for neighbor in self._flat_neighbors(index):
+                if neighbor not in affected and distance[neighbor] + 1 < best:
+                    best = distance[neighbor] + 1
+            distance[index] = best
+            if best < self.unreachable:
+                heapq.heappush(heap, (best, index))
+        while heap:
+            dist, index = heapq.heappop(heap)
+            if dist > distance[index]:
+                continue
+            for neighbor in self._flat_neighbors(index):
+                if neighbor in affected and dist + 1 < distance[neighbor]:
+                    distance[neighbor] = dist + 1
+                    heapq.heappush(heap, (dist + 1, neighbor))
+    
+    def _collect_goal(self, pos: Tuple[int, int]):
+        super()._collect_goal(pos)
+        self._remove_goal_from_field(pos[0] * self.cols + pos[1])
+    
+    def _decide_action(self, perception: Perception) -> Optional[Tuple[int, int]]:
+        """Step downhill on the distance field, or act as a reflex agent"""
+        best_pos = None
+        row, col = self.position
+        best_dist = self.distance[row * self.cols + col]
+        for dr, dc in perception.moves:
+            dist = self.distance[(row + dr) * self.cols + col + dc]
+            if dist < best_dist:
+                best_pos, best_dist = (row + dr, col + dc), dist
+        
+        if best_pos is None:
+            return super()._decide_action(perception)
+        return best_pos
+
+def compare_agents(grid_size: Tuple[int, int], obstacle_density: float = 0.2, seeds: int = 10,
+                   max_steps: int = 10000) -> dict:
+    """Run ReflexAgent and PlanningAgent on the same seeded worlds
+    
+    Returns mean steps, completion rate and wall time per agent class.
+    """
+    results = {}
+    for agent_class in (ReflexAgent, PlanningAgent):
+        steps, completed = 0, 0
+        start = time.perf_counter()
+        for seed in range(seeds):
+            agent = agent_class(grid_size, obstacle_density, seed=seed, quiet=True, connected=True)
+            agent.run_simulation(max_steps=max_steps, verbose=False)
+            steps += agent.steps_taken
+            completed += agent.remaining_goals == 0
+        results[agent_class.__name__] = {
+            'mean_steps': steps / seeds,
+            'completion_rate': completed / seeds,
+            'wall_time': time.perf_counter() - start,
+        }
+    return results
 
 # Example usage and demonstration
 if __name__ == "__main__":
@@ -233,4 +697,10 @@ if __name__ == "__main__":
     
     # Create another agent for a faster demo
     agent2 = ReflexAgent(grid_size=(6, 6), obstacle_density=0.1)
-    agent2.run_simulation(max_steps=30, delay=0.3, verbose=True)
\ No newline at end of file
+    agent2.run_simulation(max_steps=30, delay=0.3, verbose=True)
+    
+    print("\n" + "="*50)
+    print("=== Reflex vs planning agent (30x30, 10 worlds) ===")
+    for name, stats in compare_agents(grid_size=(30, 30), obstacle_density=0.2).items():
+        print(f"{name}: {stats['mean_steps']:.1f} steps, "
+              f"{stats['completion_rate']:.0%} completed, {stats['wall_time']:.2f}s")
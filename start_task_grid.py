@@ -1,6 +1,16 @@
 # 2. Python program to read an ASCII grid, find the start 'S',
 #    and list all task cells 'T'.
 
+import mmap
+import os
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from heapq import merge
+
+# Size of the line-aligned pieces a grid file is scanned in
+CHUNK_BYTES = 64 * 1024 * 1024
+
 def find_special_cells(grid):
   """
   This function finds the coordinates of the 'S' (start) and all 'T' (task)
@@ -28,6 +38,118 @@ def find_special_cells(grid):
 
   return start_coords, task_coords
 
+def line_offsets(data, start, end):
+  """
+  Builds the line-offset index of data[start:end]: the offset of the first
+  byte of every line, so the row of any offset is found by bisection.
+  """
+  offsets = array('q', [start])
+  pos = data.find(b"\n", start, end)
+  while pos != -1 and pos + 1 < end:
+    offsets.append(pos + 1)
+    pos = data.find(b"\n", pos + 1, end)
+  return offsets
+
+def scan_chunk(path, start, end, markers):
+  """
+  Finds every marker byte in bytes [start, end) of a grid file.
+
+  Args:
+    path: The grid file.
+    start, end: Byte range; start must be the first byte of a line.
+    markers: Bytes to look for, e.g. b"ST".
+
+  Returns:
+    A tuple of the number of lines in the range and a list of
+    (marker, row, col) with rows counted from the start of the range,
+    in file order.
+  """
+  with open(path, "rb") as f:
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+      # One bulk search per marker, then merged back into file order
+      found = []
+      for marker in markers:
+        needle = bytes([marker])
+        hits = []
+        pos = data.find(needle, start, end)
+        while pos != -1:
+          hits.append((pos, chr(marker)))
+          pos = data.find(needle, pos + 1, end)
+        found.append(hits)
+
+      offsets = line_offsets(data, start, end)
+      cells = []
+      for pos, marker in merge(*found):
+        row = bisect_right(offsets, pos) - 1
+        cells.append((marker, row, pos - offsets[row]))
+      return len(offsets) if end > start else 0, cells
+
+def chunk_ranges(path, chunk_bytes=CHUNK_BYTES):
+  """
+  Splits a grid file into byte ranges of about chunk_bytes that start
+  and end on line boundaries.
+  """
+  size = os.path.getsize(path)
+  if size == 0:
+    return []
+  ranges = []
+  with open(path, "rb") as f:
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+      start = 0
+      while start < size:
+        end = data.find(b"\n", min(start + chunk_bytes, size) - 1)
+        end = size if end == -1 else end + 1
+        ranges.append((start, end))
+        start = end
+  return ranges
+
+def scan_grid_file(path, markers="ST", workers=1, chunk_bytes=CHUNK_BYTES):
+  """
+  Streams the marker cells of a grid file without loading it into memory.
+
+  The file is memory-mapped and split into line-aligned chunks; with
+  workers > 1 the chunks are scanned in a process pool. Results still
+  come out in file order.
+
+  Args:
+    path: The grid file, one grid row per line.
+    markers: The marker characters to find.
+    workers: Number of processes to scan with.
+    chunk_bytes: Approximate chunk size in bytes.
+
+  Yields:
+    (marker, row, col) for every marker cell.
+  """
+  marker_bytes = markers.encode() if isinstance(markers, str) else bytes(markers)
+  ranges = chunk_ranges(path, chunk_bytes)
+  row_base = 0
+  if workers > 1 and len(ranges) > 1:
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+      results = executor.map(scan_chunk, [path] * len(ranges), [r[0] for r in ranges],
+                             [r[1] for r in ranges], [marker_bytes] * len(ranges))
+      for lines, cells in results:
+        for marker, row, col in cells:
+          yield marker, row_base + row, col
+        row_base += lines
+  else:
+    for start, end in ranges:
+      lines, cells = scan_chunk(path, start, end, marker_bytes)
+      for marker, row, col in cells:
+        yield marker, row_base + row, col
+      row_base += lines
+
+def find_special_cells_in_file(path, workers=1):
+  """
+  File version of find_special_cells for grids too large for memory.
+
+  Returns:
+    A tuple of the start coordinates (row, col), or None, and a generator
+    of task coordinates. The scan for the start stops at the first 'S'.
+  """
+  start_coords = next(((row, col) for _, row, col in scan_grid_file(path, "S")), None)
+  tasks = ((row, col) for _, row, col in scan_grid_file(path, "T", workers=workers))
+  return start_coords, tasks
+
 # --- Main part of the program ---
 if __name__ == "__main__":
   # Define an ASCII grid as a list of strings
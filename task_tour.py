@@ -0,0 +1,287 @@
+# Shortest route from the start 'S' through every task 'T' of an ASCII
+# grid, moving up/down/left/right and never through '#' walls.
+#
+# Distances between special cells come from one BFS per cell and are
+# cached per grid. The visiting order is solved exactly (Held-Karp) for
+# few tasks and by nearest neighbour plus 2-opt / Or-opt improvement,
+# within a time budget, for many.
+
+import hashlib
+import math
+import random
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from start_task_grid import find_special_cells
+
+Cell = Tuple[int, int]
+
+# Most tasks solved exactly; Held-Karp needs 2**n * n states
+EXACT_TASK_LIMIT = 12
+
+# Distance matrices: (grid hash, points) -> len(points) x len(points) matrix
+_distance_cache: "OrderedDict[Tuple[str, Tuple[Cell, ...]], List[List[float]]]" = OrderedDict()
+DISTANCE_CACHE_ENTRIES = 16
+
+@dataclass
+class TourPlan:
+    """Result of plan_tour"""
+    start: Optional[Cell]
+    order: List[Cell]                 # tasks in visiting order
+    length: float                     # total steps, start to last task
+    method: str                       # "held-karp", "heuristic" or "none"
+    unreachable: List[Cell] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)  # seconds per stage
+
+def grid_hash(grid) -> str:
+    """Stable hash of a grid (list of strings) for caching"""
+    digest = hashlib.sha256()
+    for row in grid:
+        digest.update(row.encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+def open_cells(grid) -> Tuple[bytearray, int]:
+    """Flat row-major map of walkable cells with a wall border, and its width
+
+    The border (one column and one row on each side) means BFS needs no
+    bounds checks.
+    """
+    cols = max((len(row) for row in grid), default=0) + 2
+    passable = bytearray(cols * (len(grid) + 2))
+    for r, row in enumerate(grid):
+        base = (r + 1) * cols + 1
+        for c, char in enumerate(row):
+            if char != '#':
+                passable[base + c] = 1
+    return passable, cols
+
+def bfs_to_targets(passable: bytearray, cols: int, source: Cell, targets: List[Cell]) -> List[float]:
+    """Steps from source to each target (inf if unreachable)
+
+    The search stops as soon as every target has been reached, and only
+    the target distances are kept.
+    """
+    def flat(cell):
+        return (cell[0] + 1) * cols + cell[1] + 1
+
+    wanted = {}
+    for index, target in enumerate(targets):
+        wanted.setdefault(flat(target), []).append(index)
+    result = [math.inf] * len(targets)
+    remaining = len(wanted)
+
+    seen = bytearray(len(passable))
+    start = flat(source)
+    seen[start] = 1
+    frontier = [start]
+    distance = 0
+    offsets = (-cols, cols, -1, 1)
+    while frontier and remaining:
+        next_frontier = []
+        for cell in frontier:
+            indices = wanted.get(cell)
+            if indices is not None:
+                for index in indices:
+                    result[index] = distance
+                remaining -= 1
+            for offset in offsets:
+                neighbor = cell + offset
+                if passable[neighbor] and not seen[neighbor]:
+                    seen[neighbor] = 1
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+        distance += 1
+    return result
+
+def distance_matrix(grid, points: List[Cell]) -> List[List[float]]:
+    """Pairwise shortest-path lengths between points (one BFS per point)
+
+    Matrices are cached by grid hash and point list; BFS fields are thrown
+    away once the distances to the points have been read off.
+    """
+    key = (grid_hash(grid), tuple(points))
+    matrix = _distance_cache.get(key)
+    if matrix is not None:
+        _distance_cache.move_to_end(key)
+        return matrix
+
+    # Distances are symmetric, so BFS i only has to reach points i + 1 onwards
+    passable, cols = open_cells(grid)
+    matrix = [[0.0] * len(points) for _ in points]
+    for i, point in enumerate(points):
+        for j, distance in enumerate(bfs_to_targets(passable, cols, point, points[i + 1:]), i + 1):
+            matrix[i][j] = matrix[j][i] = distance
+    _distance_cache[key] = matrix
+    while len(_distance_cache) > DISTANCE_CACHE_ENTRIES:
+        _distance_cache.popitem(last=False)
+    return matrix
+
+def path_length(matrix, path: List[int]) -> float:
+    return sum(matrix[a][b] for a, b in zip(path, path[1:]))
+
+def held_karp(matrix) -> List[int]:
+    """Exact shortest open path from node 0 through all other nodes"""
+    n = len(matrix) - 1  # tasks are nodes 1..n
+    if n == 0:
+        return [0]
+    full = (1 << n) - 1
+    # cost[mask][j]: shortest path from 0 through the tasks in mask, ending at task j
+    cost = [[math.inf] * n for _ in range(1 << n)]
+    parent = [[-1] * n for _ in range(1 << n)]
+    for j in range(n):
+        cost[1 << j][j] = matrix[0][j + 1]
+    for mask in range(1, 1 << n):
+        row = cost[mask]
+        for j in range(n):
+            base = row[j]
+            if base == math.inf or not mask >> j & 1:
+                continue
+            distances = matrix[j + 1]
+            for k in range(n):
+                if mask >> k & 1:
+                    continue
+                next_mask = mask | 1 << k
+                value = base + distances[k + 1]
+                if value < cost[next_mask][k]:
+                    cost[next_mask][k] = value
+                    parent[next_mask][k] = j
+
+    last = min(range(n), key=lambda j: cost[full][j])
+    path, mask = [], full
+    while last != -1:
+        path.append(last + 1)
+        mask, last = mask ^ (1 << last), parent[mask][last]
+    return [0] + path[::-1]
+
+def nearest_neighbor(matrix) -> List[int]:
+    """Greedy open path from node 0, always to the closest unvisited node"""
+    unvisited = set(range(1, len(matrix)))
+    path = [0]
+    while unvisited:
+        here = matrix[path[-1]]
+        nearest = min(unvisited, key=lambda node: here[node])
+        unvisited.remove(nearest)
+        path.append(nearest)
+    return path
+
+def two_opt(matrix, path: List[int], deadline: float) -> bool:
+    """One pass of segment reversals; True if the path got shorter"""
+    improved = False
+    last = len(path) - 1
+    for i in range(1, last):
+        if time.perf_counter() > deadline:
+            break
+        for j in range(i + 1, last + 1):
+            before = matrix[path[i - 1]][path[i]] + (matrix[path[j]][path[j + 1]] if j < last else 0)
+            after = matrix[path[i - 1]][path[j]] + (matrix[path[i]][path[j + 1]] if j < last else 0)
+            if after < before:
+                path[i:j + 1] = path[i:j + 1][::-1]
+                improved = True
+    return improved
+
+def or_opt(matrix, path: List[int], deadline: float) -> bool:
+    """One pass moving runs of 1-3 nodes elsewhere (optionally reversed)"""
+    improved = False
+    for length in (1, 2, 3):
+        i = 1
+        while i + length <= len(path):
+            if time.perf_counter() > deadline:
+                return improved
+            segment = path[i:i + length]
+            prev_node = path[i - 1]
+            next_node = path[i + length] if i + length < len(path) else None
+            removed = matrix[prev_node][segment[0]]
+            if next_node is not None:
+                removed += matrix[segment[-1]][next_node] - matrix[prev_node][next_node]
+            rest = path[:i] + path[i + length:]
+
+            best_gain, best_move = 1e-9, None
+            for k in range(len(rest)):  # insert after rest[k]
+                if k == i - 1:
+                    continue
+                a = rest[k]
+                b = rest[k + 1] if k + 1 < len(rest) else None
+                for candidate in (segment, segment[::-1]):
+                    added = matrix[a][candidate[0]]
+                    if b is not None:
+                        added += matrix[candidate[-1]][b] - matrix[a][b]
+                    if removed - added > best_gain:
+                        best_gain, best_move = removed - added, (k, candidate)
+            if best_move is None:
+                i += 1
+                continue
+            k, candidate = best_move
+            path[:] = rest[:k + 1] + candidate + rest[k + 1:]
+            improved = True
+    return improved
+
+def improve_path(matrix, path: List[int], time_budget: float) -> List[int]:
+    """2-opt and Or-opt until neither helps or the time budget is spent"""
+    deadline = time.perf_counter() + time_budget
+    while time.perf_counter() < deadline:
+        improved = two_opt(matrix, path, deadline)
+        improved = or_opt(matrix, path, deadline) or improved
+        if not improved:
+            break
+    return path
+
+def plan_tour(grid, time_budget: float = 1.0, exact_limit: int = EXACT_TASK_LIMIT) -> TourPlan:
+    """Shortest walk from 'S' through every reachable 'T' of grid (list of strings)
+
+    Tasks walled off from the start are left out of the tour and listed in
+    TourPlan.unreachable.
+    """
+    timings = {}
+    stage = time.perf_counter()
+    start, tasks = find_special_cells(grid)
+    timings["find"] = time.perf_counter() - stage
+    if start is None:
+        return TourPlan(None, [], math.inf, "none", unreachable=tasks, timings=timings)
+
+    stage = time.perf_counter()
+    full = distance_matrix(grid, [start] + tasks)
+    keep = [0] + [index for index in range(1, len(full)) if full[0][index] < math.inf]
+    unreachable = [tasks[index - 1] for index in range(1, len(full)) if full[0][index] == math.inf]
+    points = [start] + [tasks[index - 1] for index in keep[1:]]
+    matrix = [[full[a][b] for b in keep] for a in keep]
+    timings["distances"] = time.perf_counter() - stage
+
+    stage = time.perf_counter()
+    if len(points) - 1 <= exact_limit:
+        path, method = held_karp(matrix), "held-karp"
+    else:
+        path = improve_path(matrix, nearest_neighbor(matrix), time_budget)
+        method = "heuristic"
+    timings["order"] = time.perf_counter() - stage
+
+    return TourPlan(start, [points[node] for node in path[1:]], path_length(matrix, path),
+                    method, unreachable=unreachable, timings=timings)
+
+def random_grid(rows: int, cols: int, tasks: int, wall_density: float = 0.2, seed: int = 0) -> List[str]:
+    """Random grid with one 'S' and the given number of 'T' cells"""
+    rng = random.Random(seed)
+    cells = [['#' if rng.random() < wall_density else '.' for _ in range(cols)] for _ in range(rows)]
+    special = rng.sample(range(rows * cols), tasks + 1)
+    for index, cell in enumerate(special):
+        r, c = divmod(cell, cols)
+        cells[r][c] = 'S' if index == 0 else 'T'
+    return [''.join(row) for row in cells]
+
+# --- Demo: python task_tour.py [rows cols tasks seconds] ---
+if __name__ == "__main__":
+    rows, cols, task_count, budget = 60, 80, 150, 1.0
+    if len(sys.argv) == 5:
+        rows, cols, task_count, budget = int(sys.argv[1]), int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4])
+
+    for tasks in (min(10, task_count), task_count):
+        grid = random_grid(rows, cols, tasks, seed=tasks)
+        plan = plan_tour(grid, time_budget=budget)
+        stages = ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in plan.timings.items())
+        print(f"{tasks} tasks on {rows}x{cols}: length {plan.length} via {plan.method} "
+              f"({len(plan.unreachable)} unreachable) - {stages}")
+        if tasks <= 10:
+            print(f"  order: {plan.order}")
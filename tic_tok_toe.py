@@ -1,4 +1,9 @@
 import math
+import mmap
+import os
+import struct
+import sys
+import time
 
 # Function to print the board
 def print_board(board):
@@ -32,6 +37,7 @@ def is_moves_left(board):
 
 # Minimax algorithm
 def minimax(board, depth, is_maximizing):
+    search_stats["nodes"] += 1
     winner = check_winner(board)
     if winner == "X":
         return 1
@@ -59,8 +65,320 @@ def minimax(board, depth, is_maximizing):
                     board[i][j] = " "
         return best
 
+# Node counters for comparing search engines
+search_stats = {"nodes": 0, "tt_hits": 0}
+
+# The 8 symmetries of the 3x3 board (rotations and reflections), each as
+# the flat source index for every flat target index
+SYMMETRIES = [
+    [r * 3 + c for r in range(3) for c in range(3)],              # identity
+    [(2 - c) * 3 + r for r in range(3) for c in range(3)],        # rotate 90
+    [(2 - r) * 3 + (2 - c) for r in range(3) for c in range(3)],  # rotate 180
+    [c * 3 + (2 - r) for r in range(3) for c in range(3)],        # rotate 270
+    [r * 3 + (2 - c) for r in range(3) for c in range(3)],        # mirror left-right
+    [(2 - r) * 3 + c for r in range(3) for c in range(3)],        # mirror top-bottom
+    [c * 3 + r for r in range(3) for c in range(3)],              # main diagonal
+    [(2 - c) * 3 + (2 - r) for r in range(3) for c in range(3)],  # anti-diagonal
+]
+
+# --- Bitboard representation ---
+# Square (i, j) is bit i * 3 + j. X and O each get a 9-bit mask.
+FULL_BOARD = 0b111111111
+
+# Every three-in-a-row as a bitmask: rows, columns, diagonals
+WIN_MASKS = (
+    [0b111 << (3 * i) for i in range(3)]
+    + [0b001001001 << j for j in range(3)]
+    + [0b100010001, 0b001010100]
+)
+
+# WINNING[mask] is True when the squares in mask contain a full line
+WINNING = [any(mask & line == line for line in WIN_MASKS) for mask in range(1 << 9)]
+
+# For each symmetry, the image of every 9-bit mask
+SYMMETRY_TABLES = [
+    [sum(1 << target for target, source in enumerate(symmetry) if mask >> source & 1)
+     for mask in range(1 << 9)]
+    for symmetry in SYMMETRIES
+]
+
+class BitBoard:
+    """Tic-tac-toe board stored as two 9-bit masks, one per player"""
+    __slots__ = ("x", "o")
+
+    def __init__(self, x=0, o=0):
+        self.x = x
+        self.o = o
+
+    @classmethod
+    def from_list(cls, board):
+        x = o = 0
+        for i in range(3):
+            for j in range(3):
+                if board[i][j] == "X":
+                    x |= 1 << (i * 3 + j)
+                elif board[i][j] == "O":
+                    o |= 1 << (i * 3 + j)
+        return cls(x, o)
+
+    def to_list(self):
+        return [["X" if self.x >> (i * 3 + j) & 1 else "O" if self.o >> (i * 3 + j) & 1 else " "
+                 for j in range(3)] for i in range(3)]
+
+    def winner(self):
+        if WINNING[self.x]:
+            return "X"
+        if WINNING[self.o]:
+            return "O"
+        return None
+
+    def moves_left(self):
+        return (self.x | self.o).bit_count() < 9
+
+    def empty_squares(self):
+        taken = self.x | self.o
+        return [square for square in range(9) if not taken >> square & 1]
+
+    def make(self, square, player):
+        if player == "X":
+            self.x ^= 1 << square
+        else:
+            self.o ^= 1 << square
+
+    # Flipping the same bit again undoes the move
+    unmake = make
+
+    def canonical_key(self):
+        return canonical_bits(self.x, self.o)
+
+# Function to get one int per symmetry class of a bitboard position
+def canonical_bits(x, o):
+    return min(table[x] | table[o] << 9 for table in SYMMETRY_TABLES)
+
+# Function to score a finished game: faster wins score higher. The score
+# only depends on the board (not on where the search started), so it is
+# safe to share through the transposition table.
+def score_bits(x, o):
+    empty = 9 - (x | o).bit_count()
+    if WINNING[x]:
+        return 1 + empty
+    if WINNING[o]:
+        return -(1 + empty)
+    if empty == 0:
+        return 0
+    return None
+
+# Transposition table: (canonical board, X to move) -> (value, bound)
+# Shared by every search in the process, so it keeps paying off across
+# moves and across games.
+transposition_table = {}
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Alpha-beta search on bitboard masks x and o with a symmetry-aware
+# transposition table. Moves are made and unmade by flipping one bit.
+def alphabeta(x, o, alpha, beta, is_maximizing):
+    search_stats["nodes"] += 1
+    score = score_bits(x, o)
+    if score is not None:
+        return score
+
+    key = (canonical_bits(x, o), is_maximizing)
+    entry = transposition_table.get(key)
+    if entry is not None:
+        search_stats["tt_hits"] += 1
+        value, bound = entry
+        if bound == EXACT:
+            return value
+        if bound == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+
+    alpha_start, beta_start = alpha, beta
+    best = -math.inf if is_maximizing else math.inf
+    free = FULL_BOARD & ~(x | o)
+    while free:
+        move = free & -free  # lowest empty square
+        free ^= move
+        if is_maximizing:
+            value = alphabeta(x | move, o, alpha, beta, False)
+        else:
+            value = alphabeta(x, o | move, alpha, beta, True)
+        if is_maximizing:
+            best = max(best, value)
+            alpha = max(alpha, best)
+        else:
+            best = min(best, value)
+            beta = min(beta, best)
+        if alpha >= beta:
+            break
+
+    if best <= alpha_start:
+        transposition_table[key] = (best, UPPER)
+    elif best >= beta_start:
+        transposition_table[key] = (best, LOWER)
+    else:
+        transposition_table[key] = (best, EXACT)
+    return best
+
+# Plain minimax on bitboard masks (same tree as minimax, for benchmarking)
+def minimax_bits(x, o, is_maximizing):
+    search_stats["nodes"] += 1
+    if WINNING[x]:
+        return 1
+    if WINNING[o]:
+        return -1
+    if x | o == FULL_BOARD:
+        return 0
+
+    best = -math.inf if is_maximizing else math.inf
+    free = FULL_BOARD & ~(x | o)
+    while free:
+        move = free & -free  # lowest empty square
+        free ^= move
+        if is_maximizing:
+            best = max(best, minimax_bits(x | move, o, False))
+        else:
+            best = min(best, minimax_bits(x, o | move, True))
+    return best
+
+# --- Solved-game table ---
+# Every reachable position is solved once by build_solved_table() and saved
+# to a small binary file: a header, then for each side to move one 2-byte
+# entry per position index (signed value, best square or 255 if unset).
+# Position index = sum of 3**square * (1 for X, 2 for O).
+SOLVED_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tic_tok_toe.solved")
+SOLVED_MAGIC = b"TTTS"
+SOLVED_HEADER = struct.Struct("<4sHI")  # magic, version, positions per side
+SOLVED_ENTRY = struct.Struct("<bB")     # value (X's point of view), best square
+NUM_POSITIONS = 3 ** 9
+NO_MOVE = 255
+
+# TERNARY[mask] = sum of 3**square over the squares in mask
+TERNARY = [sum(3 ** square for square in range(9) if mask >> square & 1) for mask in range(1 << 9)]
+
+# The mapped table; False once the file was found missing at _missing_table_path,
+# so callers that fall back to search don't check the disk on every move
+_solved_table = None
+_missing_table_path = None
+
+# Function to get the table offset of a position
+def position_index(x, o, x_to_move):
+    return TERNARY[x] + 2 * TERNARY[o] + (0 if x_to_move else NUM_POSITIONS)
+
+# Function to solve every position reachable from the empty board
+# (with either player moving first) and write the table file
+def build_solved_table(path=SOLVED_TABLE_PATH):
+    global _solved_table
+    solved = {}
+
+    def solve(x, o, x_to_move):
+        key = (x, o, x_to_move)
+        if key in solved:
+            return solved[key][0]
+        value = score_bits(x, o)
+        best_square = NO_MOVE
+        if value is None:
+            best = None
+            free = FULL_BOARD & ~(x | o)
+            for square in range(9):
+                if free >> square & 1:
+                    move = 1 << square
+                    if x_to_move:
+                        child = solve(x | move, o, False)
+                    else:
+                        child = solve(x, o | move, True)
+                    # First best square in board order, like find_best_move
+                    if best is None or (child > best if x_to_move else child < best):
+                        best, best_square = child, square
+            value = best
+        solved[key] = (value, best_square)
+        return value
+
+    solve(0, 0, True)
+    solve(0, 0, False)
+
+    table = bytearray(SOLVED_ENTRY.pack(0, NO_MOVE) * (2 * NUM_POSITIONS))
+    for (x, o, x_to_move), (value, best_square) in solved.items():
+        SOLVED_ENTRY.pack_into(table, position_index(x, o, x_to_move) * SOLVED_ENTRY.size, value, best_square)
+    with open(path, "wb") as f:
+        f.write(SOLVED_HEADER.pack(SOLVED_MAGIC, 1, NUM_POSITIONS))
+        f.write(table)
+    if _solved_table is False:
+        _solved_table = None  # look again now that a table exists
+    return len(solved)
+
+# Function to memory-map the solved table on first use (None if missing)
+def load_solved_table(path=SOLVED_TABLE_PATH):
+    global _solved_table, _missing_table_path
+    if _solved_table is False and path == _missing_table_path:
+        return None
+    if _solved_table is None or _solved_table is False:
+        if not os.path.exists(path):
+            _solved_table, _missing_table_path = False, path
+            return None
+        with open(path, "rb") as f:
+            table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, positions = SOLVED_HEADER.unpack_from(table)
+        if magic != SOLVED_MAGIC or version != 1 or positions != NUM_POSITIONS:
+            raise ValueError(f"{path} is not a tic-tac-toe solved table")
+        _solved_table = table
+    return _solved_table
+
+# Function to look up the solved value and best (row, col) for a position
+# Returns None if there is no table or the position was never reached.
+def lookup_move(board, player="X"):
+    table = load_solved_table()
+    if table is None:
+        return None
+    bits = BitBoard.from_list(board)
+    offset = SOLVED_HEADER.size + position_index(bits.x, bits.o, player == "X") * SOLVED_ENTRY.size
+    value, square = SOLVED_ENTRY.unpack_from(table, offset)
+    if square == NO_MOVE:
+        return None
+    return value, divmod(square, 3)
+
+# Function to check every table entry against live search
+# Values must match alpha-beta exactly and the win/draw/loss sign of
+# minimax, and each stored move must reach the stored value.
+def check_solved_table():
+    table = load_solved_table()
+    if table is None:
+        raise FileNotFoundError(f"No solved table at {SOLVED_TABLE_PATH}; build it with --build-table")
+    checked = mismatches = 0
+    for x in range(1 << 9):
+        for o in range(1 << 9):
+            if x & o:
+                continue
+            for x_to_move in (True, False):
+                offset = SOLVED_HEADER.size + position_index(x, o, x_to_move) * SOLVED_ENTRY.size
+                value, square = SOLVED_ENTRY.unpack_from(table, offset)
+                if square == NO_MOVE:
+                    continue
+                checked += 1
+                board = BitBoard(x, o).to_list()
+                live = alphabeta(x, o, -math.inf, math.inf, x_to_move)
+                sign = minimax(board, 0, x_to_move)
+                move = 1 << square
+                after = (alphabeta(x | move, o, -math.inf, math.inf, False) if x_to_move
+                         else alphabeta(x, o | move, -math.inf, math.inf, True))
+                if value != live or (value > 0) - (value < 0) != sign or after != value:
+                    mismatches += 1
+    return checked, mismatches
+
 # Find the best move for X
-def find_best_move(board):
+# engine="table" (default) answers from the solved table when it exists
+# and falls back to "alphabeta", which uses alpha-beta with the
+# transposition table and prefers faster wins; engine="minimax" is the
+# original plain search.
+def find_best_move(board, engine="table"):
+    if engine == "table":
+        solved = lookup_move(board, "X")
+        if solved is not None:
+            return solved[1]
+
     best_val = -math.inf
     best_move = (-1, -1)
 
@@ -68,7 +386,11 @@ def find_best_move(board):
         for j in range(3):
             if board[i][j] == " ":
                 board[i][j] = "X"
-                move_val = minimax(board, 0, False)
+                if engine == "minimax":
+                    move_val = minimax(board, 0, False)
+                else:
+                    bits = BitBoard.from_list(board)
+                    move_val = alphabeta(bits.x, bits.o, best_val, math.inf, False)
                 board[i][j] = " "
                 if move_val > best_val:
                     best_move = (i, j)
@@ -76,8 +398,30 @@ def find_best_move(board):
     
     return best_move
 
+# Function to compare node throughput of the list board and the bitboard
+def benchmark_node_throughput():
+    board = [[" " for _ in range(3)] for _ in range(3)]
+    for name, search in (("list board", lambda: minimax(board, 0, True)),
+                         ("bitboard", lambda: minimax_bits(0, 0, True))):
+        search_stats["nodes"] = 0
+        start = time.perf_counter()
+        search()
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {search_stats['nodes']} nodes in {elapsed:.2f}s "
+              f"= {search_stats['nodes'] / elapsed:,.0f} nodes/sec")
+
 # --- Main Game Loop ---
-if __name__ == "__main__":
+# Run with --bench to compare search speed, --build-table to solve the
+# game into SOLVED_TABLE_PATH, or --check-table to verify that file
+if __name__ == "__main__" and "--bench" in sys.argv:
+    benchmark_node_throughput()
+elif __name__ == "__main__" and "--build-table" in sys.argv:
+    count = build_solved_table()
+    print(f"Solved {count} positions into {SOLVED_TABLE_PATH}")
+elif __name__ == "__main__" and "--check-table" in sys.argv:
+    checked, mismatches = check_solved_table()
+    print(f"Checked {checked} positions: {mismatches} mismatches")
+elif __name__ == "__main__":
     board = [[" " for _ in range(3)] for _ in range(3)]
 
     print("Tic Tac Toe - You (O) vs AI (X)")
@@ -0,0 +1,250 @@
+# Headless self-play tournament for the tic-tac-toe engines and baselines.
+# Games are played on bitboards, sharded over a process pool, and results
+# are streamed as JSON lines.
+
+import argparse
+import json
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+
+import tic_tok_toe as ttt
+
+PLAYERS = ("table", "alphabeta", "minimax", "greedy", "random")
+
+# Per-process cache of moves chosen by the deterministic players:
+# (player, x, o, side) -> square. Lives as long as the worker does.
+move_cache = {}
+
+# Function to list the empty squares of a bitboard position
+def free_squares(x, o):
+    taken = x | o
+    return [square for square in range(9) if not taken >> square & 1]
+
+# Function to pick a move with a search engine for either side
+def search_move(name, x, o, side):
+    best_val, best_square = None, None
+    for square in free_squares(x, o):
+        move = 1 << square
+        if name == "alphabeta":
+            if side == "X":
+                value = ttt.alphabeta(x | move, o, -math.inf if best_val is None else best_val, math.inf, False)
+            else:
+                value = ttt.alphabeta(x, o | move, -math.inf, math.inf if best_val is None else best_val, True)
+        else:
+            board = ttt.BitBoard(x | move, o) if side == "X" else ttt.BitBoard(x, o | move)
+            value = ttt.minimax(board.to_list(), 0, side == "O")
+        if best_val is None or (value > best_val if side == "X" else value < best_val):
+            best_val, best_square = value, square
+    return best_square
+
+# Function to pick a move from the solved table, searching if it is missing
+def table_move(x, o, side):
+    table = ttt.load_solved_table()
+    if table is not None:
+        offset = ttt.SOLVED_HEADER.size + ttt.position_index(x, o, side == "X") * ttt.SOLVED_ENTRY.size
+        _, square = ttt.SOLVED_ENTRY.unpack_from(table, offset)
+        if square != ttt.NO_MOVE:
+            return square
+    return search_move("alphabeta", x, o, side)
+
+# Function for the greedy baseline: win, else block, else centre, else random
+def greedy_move(x, o, side, rng):
+    mine, theirs = (x, o) if side == "X" else (o, x)
+    free = free_squares(x, o)
+    for target in (mine, theirs):
+        for square in free:
+            if ttt.WINNING[target | 1 << square]:
+                return square
+    if 4 in free:
+        return 4
+    return rng.choice(free)
+
+# Function to pick a move for any player, counting search nodes
+def choose_move(name, x, o, side, rng):
+    if name == "random":
+        return rng.choice(free_squares(x, o))
+    if name == "greedy":
+        return greedy_move(x, o, side, rng)
+    key = (name, x, o, side)
+    square = move_cache.get(key)
+    if square is None:
+        square = table_move(x, o, side) if name == "table" else search_move(name, x, o, side)
+        move_cache[key] = square
+    return square
+
+# Function to play one game; returns the winner ("X", "O" or None) and move count
+def play_game(player_x, player_o, first, rng, nodes):
+    x = o = 0
+    side = first
+    moves = 0
+    while True:
+        name = player_x if side == "X" else player_o
+        before = ttt.search_stats["nodes"]
+        square = choose_move(name, x, o, side, rng)
+        nodes[name] += ttt.search_stats["nodes"] - before
+        if side == "X":
+            x |= 1 << square
+            if ttt.WINNING[x]:
+                return "X", moves + 1
+        else:
+            o |= 1 << square
+            if ttt.WINNING[o]:
+                return "O", moves + 1
+        moves += 1
+        if x | o == ttt.FULL_BOARD:
+            return None, moves
+        side = "O" if side == "X" else "X"
+
+# Function to play one shard of a pairing (runs in a worker process)
+# Colours alternate every game and the first mover every two games.
+def play_shard(player_a, player_b, first_game, num_games, seed):
+    # seed is a string so every shard gets its own reproducible stream
+    rng = random.Random(seed)
+    result = {"a": player_a, "b": player_b, "games": num_games,
+              "a_wins": 0, "draws": 0, "b_wins": 0, "moves": 0}
+    nodes = {player_a: 0, player_b: 0}
+    start = time.perf_counter()
+    for game in range(first_game, first_game + num_games):
+        a_is_x = game % 2 == 0
+        first = "X" if (game // 2) % 2 == 0 else "O"
+        player_x, player_o = (player_a, player_b) if a_is_x else (player_b, player_a)
+        winner, moves = play_game(player_x, player_o, first, rng, nodes)
+        result["moves"] += moves
+        if winner is None:
+            result["draws"] += 1
+        elif (winner == "X") == a_is_x:
+            result["a_wins"] += 1
+        else:
+            result["b_wins"] += 1
+    result["nodes"] = nodes
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+# Function to run a round robin and return an iterator of shard results and
+# final standings. Arguments are checked here, before anything is played.
+# The "table" player reads the solved table at table_path, which is built
+# there if missing. By default the table next to tic_tok_toe is used if it
+# exists; otherwise one is built in a temporary directory and removed after.
+def run_tournament(players, games, shard_size=1000, workers=None, seed=0, table_path=None):
+    if games < 1 or shard_size < 1:
+        raise ValueError("games and shard_size must be at least 1")
+    return _tournament(players, games, shard_size, workers, seed, table_path)
+
+# Function to set up the solved table and play the tournament (a generator)
+def _tournament(players, games, shard_size, workers, seed, table_path):
+    temp_dir = None
+    initializer, initargs = None, ()
+    if "table" in players:
+        if table_path is None and os.path.exists(ttt.SOLVED_TABLE_PATH):
+            table_path = ttt.SOLVED_TABLE_PATH
+        elif table_path is None:
+            temp_dir = tempfile.mkdtemp(prefix="tic_tok_toe_")
+            table_path = os.path.join(temp_dir, "tic_tok_toe.solved")
+        # Solve the game once up front so the workers only have to load the file
+        if not os.path.exists(table_path):
+            ttt.build_solved_table(table_path)
+        initializer, initargs = ttt.load_solved_table, (table_path,)
+
+    try:
+        yield from _play_pairings(players, games, shard_size, workers, seed, initializer, initargs)
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+# Function to shard every pairing over a process pool and total the results
+# moves_per_sec is moves over wall time since the pool started, i.e. what the
+# whole harness achieved; worker_seconds sums the time spent inside shards.
+def _play_pairings(players, games, shard_size, workers, seed, initializer, initargs):
+    totals = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                             initializer=initializer, initargs=initargs) as executor:
+        futures = []
+        for player_a, player_b in combinations(players, 2):
+            totals[(player_a, player_b)] = {"a": player_a, "b": player_b, "games": 0, "a_wins": 0,
+                                            "draws": 0, "b_wins": 0, "moves": 0, "seconds": 0.0,
+                                            "wall_seconds": 0.0, "nodes": {player_a: 0, player_b: 0}}
+            for first_game in range(0, games, shard_size):
+                shard_games = min(shard_size, games - first_game)
+                shard_seed = f"{seed}:{player_a}:{player_b}:{first_game}"
+                futures.append(executor.submit(play_shard, player_a, player_b, first_game,
+                                               shard_games, shard_seed))
+
+        for future in as_completed(futures):
+            shard = future.result()
+            total = totals[(shard["a"], shard["b"])]
+            for field in ("games", "a_wins", "draws", "b_wins", "moves", "seconds"):
+                total[field] += shard[field]
+            for name, count in shard["nodes"].items():
+                total["nodes"][name] += count
+            # Wall time until the pairing's last shard finished
+            total["wall_seconds"] = time.perf_counter() - start
+            yield {"type": "shard", **shard}
+    wall_seconds = time.perf_counter() - start
+
+    for total in totals.values():
+        games_played = total["games"]
+        yield {
+            "type": "pairing",
+            "a": total["a"],
+            "b": total["b"],
+            "games": games_played,
+            "a_win_rate": total["a_wins"] / games_played,
+            "draw_rate": total["draws"] / games_played,
+            "b_win_rate": total["b_wins"] / games_played,
+            "avg_nodes_per_game": {name: count / games_played for name, count in total["nodes"].items()},
+            "moves_per_sec": total["moves"] / total["wall_seconds"] if total["wall_seconds"] else 0.0,
+            "wall_seconds": total["wall_seconds"],
+            "worker_seconds": total["seconds"],
+        }
+    moves = sum(total["moves"] for total in totals.values())
+    yield {
+        "type": "tournament",
+        "games": sum(total["games"] for total in totals.values()),
+        "moves": moves,
+        "wall_seconds": wall_seconds,
+        "moves_per_sec": moves / wall_seconds if wall_seconds else 0.0,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tic-tac-toe self-play tournament")
+    parser.add_argument("--players", default="table,alphabeta,greedy,random",
+                        help=f"comma-separated, from: {', '.join(PLAYERS)}")
+    parser.add_argument("--games", type=int, default=10000, help="games per pairing")
+    parser.add_argument("--shard-size", type=int, default=1000, help="games per worker task")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="-", help="JSONL file, '-' for stdout")
+    parser.add_argument("--table", default=None,
+                        help="solved table for the table player, built there if missing "
+                             "(default: tic_tok_toe.solved if present, else a temporary file)")
+    args = parser.parse_args(argv)
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    if args.shard_size < 1:
+        parser.error("--shard-size must be at least 1")
+
+    players = [name.strip() for name in args.players.split(",") if name.strip()]
+    unknown = [name for name in players if name not in PLAYERS]
+    if unknown:
+        parser.error(f"unknown players: {', '.join(unknown)}")
+
+    stream = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        for row in run_tournament(players, args.games, shard_size=args.shard_size,
+                                  workers=args.workers, seed=args.seed, table_path=args.table):
+            stream.write(json.dumps(row) + "\n")
+            stream.flush()
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+if __name__ == "__main__":
+    main()